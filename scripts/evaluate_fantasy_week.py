@@ -1,17 +1,18 @@
 from __future__ import annotations
 
 import argparse
-import json
-from datetime import datetime
+import time
 from pathlib import Path
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, List
 
+from src.data import jsonio
 from src.tools.tools import NHLTools
 
+RESULTS_DIR = Path("results")
+
 
 def _load_json(path: Path) -> Any:
-    with path.open("r", encoding="utf-8") as handle:
-        return json.load(handle)
+    return jsonio.load_path(path)
 
 
 def _parse_player_ids(value: str) -> List[int]:
@@ -35,7 +36,7 @@ def _load_scoring(scoring_json: str | None, scoring_file: Path | None) -> Dict[s
     if scoring_json and scoring_file:
         raise ValueError("Use either --scoring-json or --scoring-file, not both.")
     if scoring_json:
-        return json.loads(scoring_json)
+        return jsonio.loads(scoring_json)
     if scoring_file:
         data = _load_json(scoring_file)
         if not isinstance(data, dict):
@@ -44,52 +45,58 @@ def _load_scoring(scoring_json: str | None, scoring_file: Path | None) -> Dict[s
     return None
 
 
-def _extract_prediction(data: Any) -> Tuple[Dict[str, Any] | None, int | None]:
-    if isinstance(data, dict) and isinstance(data.get("final"), dict):
-        data = data["final"]
-    if not isinstance(data, dict):
-        return None, None
+def _extract_decision(data: Any) -> Dict[str, Any] | None:
+    # Predictions are decoded JSON, so exact type checks are sufficient.
+    if type(data) is not dict:
+        return None
+    final = data.get("final")
+    if type(final) is dict:
+        data = final
     decision = data.get("decision")
-    if not isinstance(decision, dict):
-        return None, None
+    return decision if type(decision) is dict else None
+
+
+def _extract_prediction(decision: Dict[str, Any] | None) -> int | None:
+    if decision is None:
+        return None
 
     for key in ("player_id", "predicted_player_id", "predicted_top_scorer_id"):
         value = decision.get(key)
         if value is not None:
-            return decision, int(value)
+            return int(value)
 
     top_candidates = decision.get("top_candidates") or decision.get("candidates")
-    if isinstance(top_candidates, list):
-        ranked = [c for c in top_candidates if isinstance(c, dict)]
-        ranked.sort(key=lambda c: c.get("rank", 9999))
-        for candidate in ranked:
-            value = candidate.get("player_id")
-            if value is not None:
-                return decision, int(value)
-    return decision, None
+    if type(top_candidates) is list:
+        # Lowest rank wins; min() keeps the first entry on ties, like a stable sort.
+        best = min(
+            (c for c in top_candidates if type(c) is dict and c.get("player_id") is not None),
+            key=lambda c: c.get("rank", 9999),
+            default=None,
+        )
+        if best is not None:
+            return int(best["player_id"])
+    return None
 
 
-def _extract_candidate_ids(data: Any) -> List[int]:
-    candidates: List[int] = []
-    if isinstance(data, dict) and isinstance(data.get("final"), dict):
-        data = data["final"]
-    if not isinstance(data, dict):
-        return candidates
-    decision = data.get("decision")
-    if isinstance(decision, dict):
-        for key in ("candidate_player_ids", "player_ids"):
-            value = decision.get(key)
-            if isinstance(value, list):
-                candidates.extend(int(item) for item in value)
-        top_candidates = decision.get("top_candidates") or decision.get("candidates")
-        if isinstance(top_candidates, list):
-            for entry in top_candidates:
-                if not isinstance(entry, dict):
-                    continue
-                value = entry.get("player_id")
-                if value is not None:
-                    candidates.append(int(value))
-    return list(dict.fromkeys(candidates))
+def _extract_candidate_ids(decision: Dict[str, Any] | None) -> List[int]:
+    # Insertion-ordered dict doubles as the dedup set.
+    candidates: Dict[int, None] = {}
+    if decision is None:
+        return []
+    for key in ("candidate_player_ids", "player_ids"):
+        value = decision.get(key)
+        if type(value) is list:
+            for item in value:
+                candidates.setdefault(int(item), None)
+    top_candidates = decision.get("top_candidates") or decision.get("candidates")
+    if type(top_candidates) is list:
+        for entry in top_candidates:
+            if type(entry) is not dict:
+                continue
+            value = entry.get("player_id")
+            if value is not None:
+                candidates.setdefault(int(value), None)
+    return list(candidates)
 
 
 def main() -> None:
@@ -108,7 +115,9 @@ def main() -> None:
 
     prediction_path = Path(args.prediction_file)
     prediction_data = _load_json(prediction_path)
-    decision, predicted_player_id = _extract_prediction(prediction_data)
+    # The decision is unwrapped once and shared by both extractors.
+    decision = _extract_decision(prediction_data)
+    predicted_player_id = _extract_prediction(decision)
 
     player_ids: List[int] = []
     if args.player_ids:
@@ -116,7 +125,7 @@ def main() -> None:
     elif args.player_ids_file:
         player_ids = _load_player_ids(Path(args.player_ids_file))
     else:
-        player_ids = _extract_candidate_ids(prediction_data)
+        player_ids = _extract_candidate_ids(decision)
 
     if not player_ids:
         raise SystemExit(
@@ -134,6 +143,7 @@ def main() -> None:
             end_date=args.end_date,
             scoring=scoring_rules,
             top_n=args.top_n,
+            rank_player_id=predicted_player_id,
         )
     else:
         ground_truth = tools.fantasy_best_players_week_from_games(
@@ -160,6 +170,10 @@ def main() -> None:
                     predicted_rank = idx
                     predicted_points = entry.get("fantasy_points")
                     break
+        ranked_player = ground_truth.get("ranked_player")
+        if predicted_rank is None and isinstance(ranked_player, dict):
+            predicted_rank = ranked_player.get("rank")
+            predicted_points = ranked_player.get("fantasy_points")
 
         best_entry = (results or [{}])[0]
         output = {
@@ -188,13 +202,12 @@ def main() -> None:
     if args.output:
         output_path = Path(args.output)
     else:
-        results_dir = Path("results")
-        results_dir.mkdir(parents=True, exist_ok=True)
-        stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        output_path = results_dir / f"fantasy_eval_{stamp}.json"
+        RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+        stamp = time.strftime("%Y%m%d_%H%M%S")
+        output_path = RESULTS_DIR / f"fantasy_eval_{stamp}.json"
 
-    with output_path.open("w", encoding="utf-8") as handle:
-        json.dump(output, handle, indent=2)
+    with output_path.open("wb") as handle:
+        handle.write(jsonio.dumps_bytes(output, indent=True))
     print(f"Wrote evaluation to {output_path}")
 
 
@@ -7,8 +7,19 @@ from pathlib import Path
 from typing import Dict, Iterable, List, Optional, Tuple
 from urllib.parse import urlparse
 
+try:
+    import orjson
+except ImportError:  # optional speedup: pip install -e .[fast]
+    orjson = None
 
-ENDPOINT_PATTERN = re.compile(
+try:
+    import re2 as endpoint_re
+except ImportError:  # google-re2 is optional; the stdlib engine yields the same matches
+    endpoint_re = re
+
+
+# Compiled with RE2 when available: a linear-time DFA instead of backtracking.
+ENDPOINT_PATTERN = endpoint_re.compile(
     r"(https?://api-web\.nhle\.com[^\s`]+"
     r"|https?://api\.nhle\.com/stats/rest[^\s`]+"
     r"|/v1/[^\s`;]+"
@@ -16,10 +27,25 @@ ENDPOINT_PATTERN = re.compile(
     r"|/\{lang\}[^\s`;]+"
     r"|/ping\b)"
 )
+# Cheap substring screen covering every ENDPOINT_PATTERN alternative.
+ENDPOINT_HINTS = ("nhle.com", "/v1/", "/{lang}", "/ping")
+BASE_HEADINGS = (
+    ("# NHL Web API Documentation", "web"),
+    ("# NHL Stats API Documentation", "stats"),
+)
+# Keyword rules in descending cost order; stats endpoints never cost less than 3.
+COST_RULES = (
+    (4, ("edge",)),
+    (3, ("gamecenter", "play-by-play", "wsc")),
+    (2, ("schedule", "standings", "roster")),
+)
+HEADING_LEVELS = {"##": 2, "###": 3, "####": 4}
+SLUG_PATTERN = re.compile(r"[^A-Za-z0-9]+")
+TOKEN_PATTERN = re.compile(r"\{([^}]+)\}")
 
 
 def slugify(value: str) -> str:
-    cleaned = re.sub(r"[^A-Za-z0-9]+", "_", value.strip().lower())
+    cleaned = SLUG_PATTERN.sub("_", value.strip().lower())
     return cleaned.strip("_")
 
 
@@ -48,28 +74,30 @@ def normalize_path(raw: str, base_hint: Optional[str]) -> Tuple[str, Optional[st
 
 
 def normalize_tokens(path: str) -> Tuple[str, Dict[str, str]]:
-    tokens = re.findall(r"\{([^}]+)\}", path)
-    params = {}
-    normalized_path = path
-    for token in tokens:
-        normalized = token.replace("-", "_")
-        if normalized != token:
-            normalized_path = normalized_path.replace("{" + token + "}", "{" + normalized + "}")
+    params: Dict[str, str] = {}
+    parts: List[str] = []
+    last = 0
+    for match in TOKEN_PATTERN.finditer(path):
+        normalized = match.group(1).replace("-", "_")
         params[normalized] = "string"
-    return normalized_path, params
+        parts.append(path[last : match.start()])
+        parts.append("{" + normalized + "}")
+        last = match.end()
+    if not parts:
+        return path, params
+    parts.append(path[last:])
+    return "".join(parts), params
 
 
 def cost_for(base: str, category: str, path: str) -> int:
+    floor = 3 if base == "stats" else 1
     lowered = f"{category} {path}".lower()
-    if "edge" in lowered:
-        return 4
-    if "gamecenter" in lowered or "play-by-play" in lowered or "wsc" in lowered:
-        return 3
-    if base == "stats":
-        return 3
-    if "schedule" in lowered or "standings" in lowered or "roster" in lowered:
-        return 2
-    return 1
+    for cost, keywords in COST_RULES:
+        if cost <= floor:
+            break
+        if any(keyword in lowered for keyword in keywords):
+            return cost
+    return floor
 
 
 def extract_endpoints(lines: Iterable[str]) -> List[Dict[str, str]]:
@@ -82,39 +110,36 @@ def extract_endpoints(lines: Iterable[str]) -> List[Dict[str, str]]:
 
     for line in lines:
         stripped = line.strip()
-        if stripped.startswith("```"):
-            in_code_block = not in_code_block
-            continue
-        if stripped.startswith("# NHL Web API Documentation"):
-            base = "web"
-            continue
-        if stripped.startswith("# NHL Stats API Documentation"):
-            base = "stats"
-            continue
-        if stripped.startswith("## "):
-            h2 = stripped[3:].strip()
-            h3 = None
-            h4 = None
-        elif stripped.startswith("### "):
-            h3 = stripped[4:].strip()
-            h4 = None
-        elif stripped.startswith("#### "):
-            h4 = stripped[5:].strip()
+        if stripped.startswith(("```", "#")):
+            if stripped.startswith("```"):
+                in_code_block = not in_code_block
+                continue
+            doc_base = next((value for prefix, value in BASE_HEADINGS if stripped.startswith(prefix)), None)
+            if doc_base:
+                base = doc_base
+                continue
+            marker, sep, title = stripped.partition(" ")
+            level = HEADING_LEVELS.get(marker) if sep else None
+            if level == 2:
+                h2, h3, h4 = title.strip(), None, None
+            elif level == 3:
+                h3, h4 = title.strip(), None
+            elif level == 4:
+                h4 = title.strip()
 
         if in_code_block or "Endpoint" not in line:
             continue
-
-        matches = ENDPOINT_PATTERN.findall(line)
-        if not matches:
+        if not any(hint in line for hint in ENDPOINT_HINTS):
             continue
 
+        matches = ENDPOINT_PATTERN.finditer(line)
         category_source = h3 or h2 or "uncategorized"
         category = slugify(category_source)
         description_source = h4 or h3 or h2 or "Endpoint"
         description = f"{description_source} endpoint"
 
         for match in matches:
-            path, inferred_base = normalize_path(match, base)
+            path, inferred_base = normalize_path(match.group(0), base)
             if not path or not (inferred_base or base):
                 continue
             effective_base = inferred_base or base
@@ -140,8 +165,9 @@ def build_catalog(lines: Iterable[str]) -> List[Dict[str, object]]:
         base = item["base"]
         category = item["category"]
         name_base = slugify(path.replace("/", " "))
-        name_counts[name_base] = name_counts.get(name_base, 0) + 1
-        name = name_base if name_counts[name_base] == 1 else f"{name_base}_{name_counts[name_base]}"
+        count = name_counts.get(name_base, 0) + 1
+        name_counts[name_base] = count
+        name = name_base if count == 1 else f"{name_base}_{count}"
 
         catalog.append(
             {
@@ -159,8 +185,32 @@ def build_catalog(lines: Iterable[str]) -> List[Dict[str, object]]:
     return catalog
 
 
+def merge_overrides(catalog: List[Dict[str, object]], overrides: List[object]) -> List[Dict[str, object]]:
+    # One copy per entry; the path and name indexes share it so either match updates the output.
+    by_path: Dict[object, Dict[str, object]] = {}
+    by_name: Dict[object, Dict[str, object]] = {}
+    for item in catalog:
+        entry = dict(item)
+        by_path[entry.get("path")] = entry
+        by_name[entry.get("name")] = entry
+
+    for override in overrides:
+        if not isinstance(override, dict):
+            continue
+        entry = by_path.get(override.get("path")) or by_name.get(override.get("name"))
+        if entry is not None:
+            entry.update(override)
+        else:
+            by_path[override.get("path") or override.get("name") or ""] = dict(override)
+    return list(by_path.values())
+
+
 def write_json(path: Path, data: List[Dict[str, object]]) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
+    if orjson is not None:
+        # Same bytes as the json.dump branch for catalog data (strings, ints, nested objects).
+        path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE))
+        return
     with path.open("w", encoding="utf-8") as handle:
         json.dump(data, handle, indent=2, ensure_ascii=False)
         handle.write("\n")
@@ -187,31 +237,18 @@ def main() -> None:
     args = parser.parse_args()
 
     readme_path = Path(args.readme)
-    lines = readme_path.read_text(encoding="utf-8").splitlines()
-    catalog = build_catalog(lines)
+    with readme_path.open("r", encoding="utf-8") as handle:
+        catalog = build_catalog(handle)
 
     write_json(Path(args.output_generated), catalog)
 
     overrides_path = Path(args.overrides)
     merged = catalog
     if overrides_path.exists():
-        overrides = json.loads(overrides_path.read_text(encoding="utf-8"))
+        raw_overrides = overrides_path.read_bytes()
+        overrides = orjson.loads(raw_overrides) if orjson is not None else json.loads(raw_overrides)
         if isinstance(overrides, list) and overrides:
-            by_path = {item.get("path"): dict(item) for item in catalog}
-            by_name = {item.get("name"): dict(item) for item in catalog}
-            for override in overrides:
-                if not isinstance(override, dict):
-                    continue
-                key = override.get("path")
-                if key in by_path:
-                    by_path[key].update(override)
-                else:
-                    key = override.get("name")
-                    if key in by_name:
-                        by_name[key].update(override)
-                    else:
-                        by_path[override.get("path") or override.get("name") or ""] = dict(override)
-            merged = list(by_path.values())
+            merged = merge_overrides(catalog, overrides)
 
     write_json(Path(args.output_merged), merged)
 
@@ -2,21 +2,60 @@ from __future__ import annotations
 
 import argparse
 import json
+import logging
 import os
+import queue
 import re
-from datetime import datetime, timedelta
+import sys
+import time
+from dataclasses import fields, is_dataclass
+from datetime import date, timedelta
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
 from typing import Any, Dict, List, Tuple
 
 from dotenv import load_dotenv
-from src.agent.llm_clients import AnthropicClient, GeminiClient, OpenAIClient
 from src.agent.prompt_loader import load_system_prompt
 from src.agent.runner import run_agent_loop
+from src.data import jsonio
 from src.tools.tools import DEFAULT_FANTASY_SCORING, NHLTools, build_tool_specs
 
+RESULTS_DIR = Path("results")
+RESULT_TIMESTAMP_FORMAT = "%Y%m%d_%H%M%S"
+# When set, skip the .env lookup (it walks up the directory tree) because the
+# environment is already populated, e.g. in CI or batch evaluation loops.
+SKIP_DOTENV_ENV = "FANTASY_AGENT_SKIP_DOTENV"
+FENCED_JSON_PATTERN = re.compile(r"```(?:json)?\s*(\{[\s\S]*?\})\s*```", re.IGNORECASE)
+# Greedy: spans from the first "{" to the last "}" so nested objects stay intact.
+RAW_JSON_PATTERN = re.compile(r"\{[\s\S]*\}")
+JSON_DECODER = json.JSONDecoder()
 
-def _json_dumps(value: object) -> str:
-    return json.dumps(value, default=lambda o: o.__dict__, indent=2, ensure_ascii=False)
+
+def _to_plain(value: Any) -> Any:
+    """Convert trace dataclasses (and lists of them) into plain dicts.
+
+    Dicts are assumed to already hold JSON-ready tool arguments/outputs and are
+    not copied, so large payloads are never re-walked.
+    """
+    if is_dataclass(value) and not isinstance(value, type):
+        return {field.name: _to_plain(getattr(value, field.name)) for field in fields(value)}
+    if isinstance(value, list):
+        return [_to_plain(item) for item in value]
+    return value
+
+
+def _json_dumps(value: object, cache: Dict[int, str] | None = None) -> str:
+    """Pretty-print `value`; with `cache`, reuse the rendering of an object seen before.
+
+    The cache is keyed by id(), so it must not outlive the objects it renders.
+    """
+    if cache is None:
+        return jsonio.dumps(value, indent=True)
+    key = id(value)
+    rendered = cache.get(key)
+    if rendered is None:
+        rendered = cache[key] = jsonio.dumps(value, indent=True)
+    return rendered
 
 
 def _truncate(text: str, limit: int = 8000) -> str:
@@ -25,6 +64,39 @@ def _truncate(text: str, limit: int = 8000) -> str:
     return f"{text[:limit]}\n... (truncated)"
 
 
+def _json_dumps_truncated(value: object, limit: int = 8000) -> str:
+    # Measure and slice the encoded bytes so oversized values never become one huge str.
+    encoded = jsonio.dumps_bytes(value, indent=True)
+    if len(encoded) <= limit:
+        return encoded.decode("utf-8")
+    return f"{encoded[:limit].decode('utf-8', errors='ignore')}\n... (truncated)"
+
+
+def _join_indented_object(sections: Tuple[Tuple[str, bytes], ...]) -> bytes:
+    """Assemble a top-level object from values already rendered with indent=True.
+
+    Nesting one level deeper only adds two spaces after each newline (strings never contain raw
+    newlines), so the result matches dumping the whole object at once.
+    """
+    members = b",\n".join(
+        b'  "' + key.encode("utf-8") + b'": ' + value.replace(b"\n", b"\n  ") for key, value in sections
+    )
+    return b"{\n" + members + b"\n}\n"
+
+
+def _arguments_key(arguments: object) -> Tuple[Any, ...] | None:
+    """Hashable key for flat tool arguments, or None when they contain nested containers."""
+    if type(arguments) is not dict:
+        return None
+    # Include value types: 1, 1.0 and True compare equal but render differently.
+    key = tuple((name, type(value), value) for name, value in arguments.items())
+    try:
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
+
 def _summarize_payload(payload: object) -> str:
     if isinstance(payload, list):
         return f"list[{len(payload)}]"
@@ -35,7 +107,8 @@ def _summarize_payload(payload: object) -> str:
 
 
 def _summarize_tool_output(output: object) -> str:
-    if not isinstance(output, dict):
+    # Tool outputs are plain dicts/lists, so an exact type check is enough here.
+    if type(output) is not dict:
         return _summarize_payload(output)
     if "error" in output:
         message = output.get("message")
@@ -43,35 +116,36 @@ def _summarize_tool_output(output: object) -> str:
     if "payload" in output:
         payload = output.get("payload")
         summary = _summarize_payload(payload)
-        if isinstance(payload, dict):
-            if "games" in payload and isinstance(payload["games"], list):
-                summary += f", games: {len(payload['games'])}"
-            if "gameWeek" in payload and isinstance(payload["gameWeek"], list):
-                summary += f", weeks: {len(payload['gameWeek'])}"
+        if type(payload) is dict:
+            games = payload.get("games")
+            if type(games) is list:
+                summary += f", games: {len(games)}"
+            game_week = payload.get("gameWeek")
+            if type(game_week) is list:
+                summary += f", weeks: {len(game_week)}"
         return summary
     return _summarize_payload(output)
 
 
-def _parse_date(value: str) -> datetime:
-    return datetime.strptime(value, "%Y-%m-%d")
+def _parse_date(value: str) -> date:
+    return date.fromisoformat(value)
 
 
 def _compute_next_week(as_of_date: str) -> Tuple[str, str]:
     start = _parse_date(as_of_date) + timedelta(days=1)
     end = start + timedelta(days=6)
-    return start.strftime("%Y-%m-%d"), end.strftime("%Y-%m-%d")
+    return start.isoformat(), end.isoformat()
 
 
 def _load_json(path: Path) -> Any:
-    with path.open("r", encoding="utf-8") as handle:
-        return json.load(handle)
+    return jsonio.load_path(path)
 
 
 def _load_scoring(scoring_json: str | None, scoring_file: Path | None) -> Dict[str, Any] | None:
     if scoring_json and scoring_file:
         raise ValueError("Use either --scoring-json or --scoring-file, not both.")
     if scoring_json:
-        return json.loads(scoring_json)
+        return jsonio.loads(scoring_json)
     if scoring_file:
         data = _load_json(scoring_file)
         if not isinstance(data, dict):
@@ -90,77 +164,78 @@ def _parse_player_ids(value: str) -> List[int]:
     return ids
 
 
-def _extract_prediction(data: Any) -> Tuple[Dict[str, Any] | None, int | None]:
-    if isinstance(data, dict) and isinstance(data.get("final"), dict):
-        data = data["final"]
-    if not isinstance(data, dict):
-        return None, None
+def _extract_decision(data: Any) -> Dict[str, Any] | None:
+    # Predictions are decoded JSON, so exact type checks are sufficient.
+    if type(data) is not dict:
+        return None
+    final = data.get("final")
+    if type(final) is dict:
+        data = final
     decision = data.get("decision")
-    if not isinstance(decision, dict):
-        return None, None
+    return decision if type(decision) is dict else None
+
+
+def _extract_prediction(decision: Dict[str, Any] | None) -> int | None:
+    if decision is None:
+        return None
 
     for key in ("player_id", "predicted_player_id", "predicted_top_scorer_id"):
         value = decision.get(key)
         if value is not None:
-            return decision, int(value)
+            return int(value)
 
     top_candidates = decision.get("top_candidates") or decision.get("candidates")
-    if isinstance(top_candidates, list):
-        ranked = [c for c in top_candidates if isinstance(c, dict)]
-        ranked.sort(key=lambda c: c.get("rank", 9999))
-        for candidate in ranked:
-            value = candidate.get("player_id")
-            if value is not None:
-                return decision, int(value)
-    return decision, None
+    if type(top_candidates) is list:
+        # Lowest rank wins; min() keeps the first entry on ties, like a stable sort.
+        best = min(
+            (c for c in top_candidates if type(c) is dict and c.get("player_id") is not None),
+            key=lambda c: c.get("rank", 9999),
+            default=None,
+        )
+        if best is not None:
+            return int(best["player_id"])
+    return None
 
 
-def _extract_candidate_ids(data: Any) -> List[int]:
-    candidates: List[int] = []
-    if isinstance(data, dict) and isinstance(data.get("final"), dict):
-        data = data["final"]
-    if not isinstance(data, dict):
-        return candidates
-    decision = data.get("decision")
-    if isinstance(decision, dict):
-        for key in ("candidate_player_ids", "player_ids"):
-            value = decision.get(key)
-            if isinstance(value, list):
-                candidates.extend(int(item) for item in value)
-        top_candidates = decision.get("top_candidates") or decision.get("candidates")
-        if isinstance(top_candidates, list):
-            for entry in top_candidates:
-                if not isinstance(entry, dict):
-                    continue
-                value = entry.get("player_id")
-                if value is not None:
-                    candidates.append(int(value))
-    return list(dict.fromkeys(candidates))
+def _extract_candidate_ids(decision: Dict[str, Any] | None) -> List[int]:
+    # Insertion-ordered dict doubles as the dedup set.
+    candidates: Dict[int, None] = {}
+    if decision is None:
+        return []
+    for key in ("candidate_player_ids", "player_ids"):
+        value = decision.get(key)
+        if type(value) is list:
+            for item in value:
+                candidates.setdefault(int(item), None)
+    top_candidates = decision.get("top_candidates") or decision.get("candidates")
+    if type(top_candidates) is list:
+        for entry in top_candidates:
+            if type(entry) is not dict:
+                continue
+            value = entry.get("player_id")
+            if value is not None:
+                candidates.setdefault(int(value), None)
+    return list(candidates)
+
 
 def _extract_json_from_text(text: str) -> Dict[str, Any] | None:
     if not text:
         return None
-    fenced_match = re.search(r"```json\s*(\{.*?\})\s*```", text, re.DOTALL)
-    if fenced_match:
-        candidate = fenced_match.group(1)
-    else:
-        candidate = None
-        start = text.find("{")
-        if start != -1:
-            depth = 0
-            for idx in range(start, len(text)):
-                char = text[idx]
-                if char == "{":
-                    depth += 1
-                elif char == "}":
-                    depth -= 1
-                    if depth == 0:
-                        candidate = text[start : idx + 1]
-                        break
-    if not candidate:
+    # Most replies are already bare JSON; only fall back to pattern search when they are not.
+    try:
+        parsed = jsonio.loads(text)
+    except json.JSONDecodeError:
+        parsed = None
+    if isinstance(parsed, dict):
+        return parsed
+    fenced_match = FENCED_JSON_PATTERN.search(text)
+    match = fenced_match or RAW_JSON_PATTERN.search(text)
+    if not match:
         return None
+    candidate = match.group(1) if fenced_match else match.group(0)
     try:
-        parsed = json.loads(candidate)
+        # raw_decode stops at the end of the first object, so trailing braces in prose are ignored.
+        parsed, _ = JSON_DECODER.raw_decode(candidate)
     except json.JSONDecodeError:
         return None
     return parsed if isinstance(parsed, dict) else None
@@ -181,57 +256,25 @@ def _extract_top3_prediction(final: Any) -> List[Dict[str, Any]]:
     return []
 
 
-def _parse_toi_to_seconds(value: Any) -> int:
-    if value is None:
-        return 0
-    text = str(value).strip()
-    if not text:
-        return 0
-    parts = text.split(":")
-    if len(parts) == 2:
-        minutes, seconds = parts
-        return int(minutes) * 60 + int(seconds)
-    if len(parts) == 3:
-        hours, minutes, seconds = parts
-        return int(hours) * 3600 + int(minutes) * 60 + int(seconds)
-    return 0
-
-
-def _collect_game_ids_for_week(tools: NHLTools, start_date: str, end_date: str) -> List[int]:
-    payload = tools.client.get_json(f"schedule/{start_date}")
-    game_ids: List[int] = []
-    for day in payload.get("gameWeek", []):
-        date_str = (day.get("date") or "")[:10]
-        if not (start_date <= date_str <= end_date):
-            continue
-        for game in day.get("games", []):
-            game_id = game.get("id") or game.get("gameId") or game.get("gamePk")
-            if game_id is not None:
-                game_ids.append(int(game_id))
-    return list(dict.fromkeys(game_ids))
-
-
-def _collect_player_ids_for_week(
-    tools: NHLTools, start_date: str, end_date: str, min_toi_seconds: int = 60
-) -> List[int]:
-    player_ids: List[int] = []
-    game_ids = _collect_game_ids_for_week(tools, start_date, end_date)
-    for game_id in game_ids:
-        boxscore = tools.client.get_json(f"gamecenter/{game_id}/boxscore")
-        player_stats = boxscore.get("playerByGameStats", {})
-        for team_key in ("homeTeam", "awayTeam"):
-            team = player_stats.get(team_key, {})
-            for group_key in ("forwards", "defense", "goalies", "skaters"):
-                for player in team.get(group_key, []) or []:
-                    toi = player.get("toi") or player.get("timeOnIce")
-                    if _parse_toi_to_seconds(toi) >= min_toi_seconds:
-                        player_id = player.get("playerId") or player.get("id")
-                        if player_id is not None:
-                            player_ids.append(int(player_id))
-    return list(dict.fromkeys(player_ids))
+def _configure_logging(verbose: bool) -> QueueListener:
+    # Tool progress goes to stdout as plain lines; payload dumps are DEBUG and only shown with --verbose.
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    # The agent loop only enqueues records; a listener thread does the formatting and stdout writes.
+    records: queue.SimpleQueue = queue.SimpleQueue()
+    listener = QueueListener(records, handler)
+    agent_logger = logging.getLogger("src.agent")
+    agent_logger.addHandler(QueueHandler(records))
+    agent_logger.setLevel(logging.DEBUG if verbose else logging.INFO)
+    agent_logger.propagate = False
+    listener.start()
+    return listener
 
 
 def _build_client(provider: str, model: str):
+    # Adapters import their provider SDK in __init__, so only the selected SDK is ever loaded.
+    from src.agent.llm_clients import AnthropicClient, GeminiClient, OpenAIClient
+
     if provider == "openai":
         return OpenAIClient(model=model, api_key=os.getenv("OPENAI_API_KEY"), base_url=os.getenv("OPENAI_BASE_URL"))
     if provider == "gemini":
@@ -242,7 +285,8 @@ def _build_client(provider: str, model: str):
 
 
 def main() -> None:
-    load_dotenv()
+    if not os.getenv(SKIP_DOTENV_ENV):
+        load_dotenv()
     parser = argparse.ArgumentParser(description="Run the fantasy NHL agent.")
     parser.add_argument("message", nargs="?", help="Optional user message to send to the agent.")
     parser.add_argument("--provider", choices=["openai", "gemini", "anthropic"], required=True)
@@ -256,6 +300,7 @@ def main() -> None:
     parser.add_argument("--player-ids-file", help="JSON file with list of player IDs for evaluation.")
     parser.add_argument("--top-n", type=int, default=5, help="How many players to return in evaluation.")
     args = parser.parse_args()
+    log_listener = _configure_logging(args.verbose)
 
     system_prompt = load_system_prompt(args.prompt)
     scoring_overrides = _load_scoring(args.scoring_json, Path(args.scoring_file) if args.scoring_file else None)
@@ -269,7 +314,7 @@ def main() -> None:
         "include a candidate_player_ids list used for ranking."
     )
 
-    tools = NHLTools(as_of_date=args.as_of_date)
+    tools = NHLTools(as_of_date=args.as_of_date, prefetch_search_results=True)
     tool_specs = build_tool_specs(tools, include_eval_tools=False)
     llm_client = _build_client(args.provider, args.model)
 
@@ -279,21 +324,27 @@ def main() -> None:
         or f"Predict the best fantasy player for {start_date} to {end_date} using the scoring rules provided."
     )
 
-    response = run_agent_loop(
-        llm_client=llm_client,
-        system_prompt=system_prompt,
-        user_message=user_message,
-        tool_specs=tool_specs,
-        debug=args.verbose,
-    )
+    try:
+        response = run_agent_loop(
+            llm_client=llm_client,
+            system_prompt=system_prompt,
+            user_message=user_message,
+            tool_specs=tool_specs,
+            debug=args.verbose,
+        )
+    finally:
+        # Drain queued tool lines so they land before anything printed afterwards.
+        log_listener.stop()
 
-    predicted_decision, predicted_player_id = _extract_prediction(response.final)
+    # The decision is unwrapped once and shared by both extractors.
+    predicted_decision = _extract_decision(response.final)
+    predicted_player_id = _extract_prediction(predicted_decision)
     if args.player_ids:
         candidate_player_ids = _parse_player_ids(args.player_ids)
     elif args.player_ids_file:
         candidate_player_ids = _load_json(Path(args.player_ids_file))
     else:
-        candidate_player_ids = _extract_candidate_ids(response.final)
+        candidate_player_ids = _extract_candidate_ids(predicted_decision)
 
     evaluation: Dict[str, Any] | None = None
     eval_tools = NHLTools(as_of_date=None)
@@ -312,25 +363,29 @@ def main() -> None:
             end_date=end_date,
             scoring=scoring_rules,
             top_n=args.top_n,
+            rank_player_id=predicted_player_id,
         )
         candidate_source = "user_supplied"
 
     if "error" in ground_truth:
         evaluation = {"error": ground_truth}
     else:
-        predicted_points = None
-        predicted_rank = None
-        if predicted_player_id is not None:
-            for idx, entry in enumerate(ground_truth.get("results", []), start=1):
-                if entry.get("player_id") == predicted_player_id:
-                    predicted_rank = idx
-                    predicted_points = entry.get("fantasy_points")
-                    break
         results = ground_truth.get("results", [])
         best_entry = (results or [{}])[0]
-        actual_points_by_player = {
-            entry.get("player_id"): entry.get("fantasy_points") for entry in results if isinstance(entry, dict)
-        }
+        actual_points_by_player: Dict[Any, Any] = {}
+        rank_by_player: Dict[Any, int] = {}
+        for idx, entry in enumerate(results, start=1):
+            if not isinstance(entry, dict):
+                continue
+            player_id = entry.get("player_id")
+            actual_points_by_player[player_id] = entry.get("fantasy_points")
+            rank_by_player.setdefault(player_id, idx)
+        predicted_rank = rank_by_player.get(predicted_player_id) if predicted_player_id is not None else None
+        predicted_points = actual_points_by_player.get(predicted_player_id) if predicted_rank is not None else None
+        ranked_player = ground_truth.get("ranked_player")
+        if predicted_rank is None and isinstance(ranked_player, dict):
+            predicted_rank = ranked_player.get("rank")
+            predicted_points = ranked_player.get("fantasy_points")
         predicted_top3 = _extract_top3_prediction(response.final)
         predicted_top3_with_actual = []
         for entry in predicted_top3[:3]:
@@ -367,127 +422,147 @@ def main() -> None:
             },
         }
 
-    output = {"final": response.final, "trace": response.trace, "evaluation": evaluation}
-    results_dir = Path("results")
-    results_dir.mkdir(parents=True, exist_ok=True)
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    stem = f"agent_result_{timestamp}"
-    json_path = results_dir / f"{stem}.json"
-    md_path = results_dir / f"{stem}.md"
-
-    with json_path.open("w", encoding="utf-8") as handle:
-        json.dump(output, handle, default=lambda o: o.__dict__, indent=2)
-
-    with md_path.open("w", encoding="utf-8") as handle:
-        handle.write("# Agent Result\n\n")
-        handle.write("## Summary\n\n")
-        if isinstance(response.final, dict):
-            status = response.final.get("status")
-            if status:
-                handle.write(f"- Status: {status}\n")
-            error = response.final.get("error")
-            if error:
-                handle.write(f"- Error: {error}\n")
-            handle.write("\n")
-        if evaluation is None:
-            handle.write("- Evaluation: not run\n\n")
-        elif "error" in evaluation:
-            handle.write("- Evaluation: error\n\n")
+    # Convert the trace once; both the JSON result and the markdown summary read the plain form.
+    trace_plain = _to_plain(response.trace)
+    RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+    stem = f"agent_result_{time.strftime(RESULT_TIMESTAMP_FORMAT)}"
+    json_path = RESULTS_DIR / f"{stem}.json"
+    md_path = RESULTS_DIR / f"{stem}.md"
+
+    # Everything rendered below stays referenced by locals until main returns.
+    # The final and evaluation renderings are shared with the markdown sections that embed them.
+    rendered: Dict[int, str] = {}
+    final_plain = _to_plain(response.final)
+    sections = (
+        ("final", _json_dumps(final_plain, rendered).encode("utf-8")),
+        ("trace", jsonio.dumps_bytes(trace_plain, indent=True)),
+        ("evaluation", _json_dumps(evaluation, rendered).encode("utf-8")),
+    )
+    with json_path.open("wb") as handle:
+        handle.write(_join_indented_object(sections))
+
+    parts: List[str] = []
+    write = parts.append
+    write("# Agent Result\n\n")
+    write("## Summary\n\n")
+    if isinstance(response.final, dict):
+        status = response.final.get("status")
+        if status:
+            write(f"- Status: {status}\n")
+        error = response.final.get("error")
+        if error:
+            write(f"- Error: {error}\n")
+        write("\n")
+    if evaluation is None:
+        write("- Evaluation: not run\n\n")
+    elif "error" in evaluation:
+        write("- Evaluation: error\n\n")
+    else:
+        correct = evaluation.get("evaluation", {}).get("correct_best")
+        write(f"- Evaluation: correct_best={correct}\n")
+        predicted_top3 = evaluation.get("prediction", {}).get("top_3", [])
+        actual_top3 = evaluation.get("ground_truth", {}).get("top_n", [])
+        if predicted_top3:
+            write("- Predicted Top 3 (predicted vs actual):\n")
+            for idx, pred in enumerate(predicted_top3[:3], start=1):
+                pred_name = pred.get("player_name") or pred.get("player_id") or ""
+                pred_fp = pred.get("predicted_fantasy_points", "")
+                actual_fp = pred.get("actual_fantasy_points", "")
+                write(f"  {idx}. {pred_name} — {pred_fp} (actual {actual_fp})\n")
+        if actual_top3:
+            write("- Actual Top 3:\n")
+            for idx, act in enumerate(actual_top3[:3], start=1):
+                act_name = None
+                if isinstance(act.get("name"), dict):
+                    act_name = act.get("name", {}).get("default")
+                act_name = act_name or act.get("player_id") or ""
+                act_fp = act.get("fantasy_points", "")
+                write(f"  {idx}. {act_name} — {act_fp}\n")
+        write("\n")
+        # No separate Prediction vs Actual section; summary contains the comparison.
+
+    write("## Final\n\n")
+    if isinstance(response.final, dict) and "prediction" in response.final:
+        write("### Prediction\n\n")
+        write("```json\n")
+        write(_json_dumps(response.final.get("prediction"), rendered))
+        write("\n```\n\n")
+
+    if isinstance(response.final, dict) and "reasoning" in response.final:
+        reasoning = response.final.get("reasoning")
+        write("### Reasoning\n\n")
+        if isinstance(reasoning, list):
+            for item in reasoning:
+                write(f"- {item}\n")
+            write("\n")
+        else:
+            write("```json\n")
+            write(_json_dumps(reasoning, rendered))
+            write("\n```\n\n")
+
+    if isinstance(response.final, dict) and "reasoning" not in response.final and "raw" in response.final:
+        write("### Reasoning (from model output, truncated)\n\n")
+        write("```text\n")
+        write(_truncate(str(response.final.get("raw"))))
+        write("\n```\n\n")
+
+    if isinstance(response.final, dict) and "data_used" in response.final:
+        data_used = response.final.get("data_used")
+        write("### Data Used\n\n")
+        tool_calls = data_used.get("tool_calls") if isinstance(data_used, dict) else None
+        if isinstance(tool_calls, list):
+            write("| Tool | Path | Date Coverage | Notes |\n")
+            write("| --- | --- | --- | --- |\n")
+            for entry in tool_calls:
+                if not isinstance(entry, dict):
+                    continue
+                tool = entry.get("tool", "")
+                path = entry.get("path_template") or entry.get("path") or ""
+                date_coverage = entry.get("date_coverage", "")
+                notes = entry.get("notes", "")
+                write(f"| {tool} | {path} | {date_coverage} | {notes} |\n")
+            write("\n")
         else:
-            correct = evaluation.get("evaluation", {}).get("correct_best")
-            handle.write(f"- Evaluation: correct_best={correct}\n")
-            predicted_top3 = evaluation.get("prediction", {}).get("top_3", [])
-            actual_top3 = evaluation.get("ground_truth", {}).get("top_n", [])
-            if predicted_top3:
-                handle.write("- Predicted Top 3 (predicted vs actual):\n")
-                for idx, pred in enumerate(predicted_top3[:3], start=1):
-                    pred_name = pred.get("player_name") or pred.get("player_id") or ""
-                    pred_fp = pred.get("predicted_fantasy_points", "")
-                    actual_fp = pred.get("actual_fantasy_points", "")
-                    handle.write(f"  {idx}. {pred_name} — {pred_fp} (actual {actual_fp})\n")
-            if actual_top3:
-                handle.write("- Actual Top 3:\n")
-                for idx, act in enumerate(actual_top3[:3], start=1):
-                    act_name = None
-                    if isinstance(act.get("name"), dict):
-                        act_name = act.get("name", {}).get("default")
-                    act_name = act_name or act.get("player_id") or ""
-                    act_fp = act.get("fantasy_points", "")
-                    handle.write(f"  {idx}. {act_name} — {act_fp}\n")
-            handle.write("\n")
-            # No separate Prediction vs Actual section; summary contains the comparison.
-
-        handle.write("## Final\n\n")
-        if isinstance(response.final, dict) and "prediction" in response.final:
-            handle.write("### Prediction\n\n")
-            handle.write("```json\n")
-            handle.write(_json_dumps(response.final.get("prediction")))
-            handle.write("\n```\n\n")
-
-        if isinstance(response.final, dict) and "reasoning" in response.final:
-            reasoning = response.final.get("reasoning")
-            handle.write("### Reasoning\n\n")
-            if isinstance(reasoning, list):
-                for item in reasoning:
-                    handle.write(f"- {item}\n")
-                handle.write("\n")
-            else:
-                handle.write("```json\n")
-                handle.write(_json_dumps(reasoning))
-                handle.write("\n```\n\n")
-
-        if isinstance(response.final, dict) and "reasoning" not in response.final and "raw" in response.final:
-            handle.write("### Reasoning (from model output, truncated)\n\n")
-            handle.write("```text\n")
-            handle.write(_truncate(str(response.final.get("raw"))))
-            handle.write("\n```\n\n")
-
-        if isinstance(response.final, dict) and "data_used" in response.final:
-            data_used = response.final.get("data_used")
-            handle.write("### Data Used\n\n")
-            tool_calls = data_used.get("tool_calls") if isinstance(data_used, dict) else None
-            if isinstance(tool_calls, list):
-                handle.write("| Tool | Path | Date Coverage | Notes |\n")
-                handle.write("| --- | --- | --- | --- |\n")
-                for entry in tool_calls:
-                    if not isinstance(entry, dict):
-                        continue
-                    tool = entry.get("tool", "")
-                    path = entry.get("path_template") or entry.get("path") or ""
-                    date_coverage = entry.get("date_coverage", "")
-                    notes = entry.get("notes", "")
-                    handle.write(f"| {tool} | {path} | {date_coverage} | {notes} |\n")
-                handle.write("\n")
-            else:
-                handle.write("```json\n")
-                handle.write(_json_dumps(data_used))
-                handle.write("\n```\n\n")
-
-        if not isinstance(response.final, dict) or "decision" not in response.final:
-            handle.write("### Final (raw JSON)\n\n")
-            handle.write("```json\n")
-            handle.write(_json_dumps(response.final))
-            handle.write("\n```\n\n")
-
-        if evaluation:
-            handle.write("## Evaluation\n\n")
-            handle.write("```json\n")
-            handle.write(_json_dumps(evaluation))
-            handle.write("\n```\n\n")
-
-        handle.write("## Tool Trace (summary)\n\n")
-        for idx, call in enumerate(response.trace.tool_calls, start=1):
-            handle.write(f"### Tool {idx}: {call.name}\n\n")
-            handle.write("Arguments:\n")
-            handle.write("```json\n")
-            handle.write(_truncate(_json_dumps(call.arguments)))
-            handle.write("\n```\n\n")
-            result = response.trace.tool_results[idx - 1].output if idx - 1 < len(response.trace.tool_results) else None
-            handle.write("Output summary:\n")
-            handle.write("```text\n")
-            handle.write(_summarize_tool_output(result))
-            handle.write("\n```\n\n")
-        handle.write("Full outputs are saved in the JSON result file.\n")
+            write("```json\n")
+            write(_json_dumps(data_used, rendered))
+            write("\n```\n\n")
+
+    if not isinstance(response.final, dict) or "decision" not in response.final:
+        write("### Final (raw JSON)\n\n")
+        write("```json\n")
+        write(_json_dumps(response.final, rendered))
+        write("\n```\n\n")
+
+    if evaluation:
+        write("## Evaluation\n\n")
+        write("```json\n")
+        write(_json_dumps(evaluation, rendered))
+        write("\n```\n\n")
+
+    write("## Tool Trace (summary)\n\n")
+    tool_results = trace_plain["tool_results"]
+    # Retries and pagination repeat the same flat arguments; render each distinct set once.
+    rendered_arguments: Dict[Tuple[Any, ...], str] = {}
+    for idx, call in enumerate(trace_plain["tool_calls"], start=1):
+        write(f"### Tool {idx}: {call['name']}\n\n")
+        write("Arguments:\n")
+        write("```json\n")
+        arguments_key = _arguments_key(call["arguments"])
+        arguments_text = rendered_arguments.get(arguments_key) if arguments_key is not None else None
+        if arguments_text is None:
+            arguments_text = _json_dumps_truncated(call["arguments"])
+            if arguments_key is not None:
+                rendered_arguments[arguments_key] = arguments_text
+        write(arguments_text)
+        write("\n```\n\n")
+        result = tool_results[idx - 1]["output"] if idx - 1 < len(tool_results) else None
+        write("Output summary:\n")
+        write("```text\n")
+        write(_summarize_tool_output(result))
+        write("\n```\n\n")
+    write("Full outputs are saved in the JSON result file.\n")
+
+    md_path.write_text("".join(parts), encoding="utf-8")
 
     print(f"Wrote results to {json_path} and {md_path}")
 
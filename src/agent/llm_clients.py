@@ -2,14 +2,19 @@ from __future__ import annotations
 
 import json
 import re
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional
+
+from src.data import jsonio
+
+FENCED_JSON_PATTERN = re.compile(r"```json\s*(\{.*?\})\s*```", re.DOTALL)
+FENCED_GENERIC_PATTERN = re.compile(r"```\s*(\{.*?\})\s*```", re.DOTALL)
 
 
 def _extract_json_candidate(content: str) -> str | None:
-    fenced_match = re.search(r"```json\s*(\{.*?\})\s*```", content, re.DOTALL)
+    fenced_match = FENCED_JSON_PATTERN.search(content)
     if fenced_match:
         return fenced_match.group(1)
-    fenced_generic = re.search(r"```\s*(\{.*?\})\s*```", content, re.DOTALL)
+    fenced_generic = FENCED_GENERIC_PATTERN.search(content)
     if fenced_generic:
         return fenced_generic.group(1)
 
@@ -32,12 +37,12 @@ def _parse_json(content: str) -> Dict[str, Any]:
     if not content or not content.strip():
         return {"status": "model_empty_response", "raw": content}
     try:
-        parsed = json.loads(content)
+        parsed = jsonio.loads(content)
     except json.JSONDecodeError as exc:
         candidate = _extract_json_candidate(content)
         if candidate:
             try:
-                parsed = json.loads(candidate)
+                parsed = jsonio.loads(candidate)
             except json.JSONDecodeError as candidate_exc:
                 return {
                     "status": "model_invalid_json",
@@ -51,6 +56,32 @@ def _parse_json(content: str) -> Dict[str, Any]:
     return {"status": "model_non_object_json", "raw": content, "parsed": parsed}
 
 
+class _HistoryConverter:
+    """Incrementally converts the runner's append-only transcript into provider messages.
+
+    The runner only appends, so each message is converted (and its JSON decoded) once per
+    conversation instead of on every turn. A different list object starts a new conversation.
+    """
+
+    def __init__(self, convert: Callable[[Dict[str, Any]], Optional[Dict[str, Any]]]) -> None:
+        self._convert = convert
+        self._source: Optional[List[Dict[str, Any]]] = None
+        self._consumed = 0
+        self._converted: List[Dict[str, Any]] = []
+
+    def __call__(self, messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        if messages is not self._source or len(messages) < self._consumed:
+            self._source = messages
+            self._consumed = 0
+            self._converted = []
+        for message in messages[self._consumed :]:
+            converted = self._convert(message)
+            if converted is not None:
+                self._converted.append(converted)
+        self._consumed = len(messages)
+        return self._converted
+
+
 def _build_openai_tools(tool_specs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     return [{"type": "function", "function": tool} for tool in tool_specs]
 
@@ -77,7 +108,7 @@ class OpenAIClient:
             return {
                 "type": "tool_call",
                 "name": tool_call.function.name,
-                "arguments": json.loads(tool_call.function.arguments or "{}"),
+                "arguments": jsonio.loads(tool_call.function.arguments or "{}"),
                 "id": tool_call.id,
             }
         if not message.content:
@@ -91,47 +122,45 @@ class AnthropicClient:
 
         self.client = Anthropic(api_key=api_key)
         self.model = model
-
-    def generate(self, messages: List[Dict[str, Any]], tools: List[Dict[str, Any]]) -> Dict[str, Any]:
-        system_text = ""
-        anthropic_messages: List[Dict[str, Any]] = []
-
-        for message in messages:
-            role = message.get("role")
-            if role == "system":
-                system_text = message.get("content", "")
-                continue
-
-            if role == "assistant" and message.get("tool_calls"):
-                content_blocks = []
-                for call in message["tool_calls"]:
-                    content_blocks.append(
-                        {
-                            "type": "tool_use",
-                            "id": call.get("id", "call_0"),
-                            "name": call.get("function", {}).get("name"),
-                            "input": json.loads(call.get("function", {}).get("arguments", "{}")),
-                        }
-                    )
-                anthropic_messages.append({"role": "assistant", "content": content_blocks})
-                continue
-
-            if role == "tool":
-                anthropic_messages.append(
+        self._history = _HistoryConverter(self._convert_message)
+
+    @staticmethod
+    def _convert_message(message: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        role = message.get("role")
+        if role == "system":
+            return None
+
+        if role == "assistant" and message.get("tool_calls"):
+            content_blocks = []
+            for call in message["tool_calls"]:
+                content_blocks.append(
                     {
-                        "role": "user",
-                        "content": [
-                            {
-                                "type": "tool_result",
-                                "tool_use_id": message.get("tool_call_id", "call_0"),
-                                "content": message.get("content", ""),
-                            }
-                        ],
+                        "type": "tool_use",
+                        "id": call.get("id", "call_0"),
+                        "name": call.get("function", {}).get("name"),
+                        "input": jsonio.loads(call.get("function", {}).get("arguments", "{}")),
                     }
                 )
-                continue
+            return {"role": "assistant", "content": content_blocks}
+
+        if role == "tool":
+            return {
+                "role": "user",
+                "content": [
+                    {
+                        "type": "tool_result",
+                        "tool_use_id": message.get("tool_call_id", "call_0"),
+                        "content": message.get("content", ""),
+                    }
+                ],
+            }
 
-            anthropic_messages.append({"role": role, "content": message.get("content", "")})
+        return {"role": role, "content": message.get("content", "")}
+
+    def generate(self, messages: List[Dict[str, Any]], tools: List[Dict[str, Any]]) -> Dict[str, Any]:
+        # The runner always opens the transcript with its single system message.
+        system_text = messages[0].get("content", "") if messages and messages[0].get("role") == "system" else ""
+        anthropic_messages = self._history(messages)
 
         response = self.client.messages.create(
             model=self.model,
@@ -161,6 +190,10 @@ class GeminiClient:
         genai.configure(api_key=api_key)
         self.genai = genai
         self.model = model
+        self._history = _HistoryConverter(self._to_content)
+        # The runner passes the same tool list every turn; keep the model built for it.
+        self._tools: Optional[List[Dict[str, Any]]] = None
+        self._generative_model: Any = None
 
     def _build_tools(self, tools: List[Dict[str, Any]]) -> List[Any]:
         function_declarations = []
@@ -174,50 +207,45 @@ class GeminiClient:
             )
         return [self.genai.types.Tool(function_declarations=function_declarations)]
 
-    def _to_contents(self, messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        contents: List[Dict[str, Any]] = []
-        for message in messages:
-            role = message.get("role")
-            if role == "system":
-                contents.append({"role": "user", "parts": [{"text": message.get("content", "")}]})
-                continue
-
-            if role == "assistant" and message.get("tool_calls"):
-                parts = []
-                for call in message["tool_calls"]:
-                    parts.append(
-                        {
-                            "function_call": {
-                                "name": call.get("function", {}).get("name"),
-                                "args": json.loads(call.get("function", {}).get("arguments", "{}")),
-                            }
-                        }
-                    )
-                contents.append({"role": "model", "parts": parts})
-                continue
+    @staticmethod
+    def _to_content(message: Dict[str, Any]) -> Dict[str, Any]:
+        role = message.get("role")
+        if role == "system":
+            return {"role": "user", "parts": [{"text": message.get("content", "")}]}
 
-            if role == "tool":
-                contents.append(
+        if role == "assistant" and message.get("tool_calls"):
+            parts = []
+            for call in message["tool_calls"]:
+                parts.append(
                     {
-                        "role": "user",
-                        "parts": [
-                            {
-                                "function_response": {
-                                    "name": message.get("name"),
-                                    "response": json.loads(message.get("content", "{}")),
-                                }
-                            }
-                        ],
+                        "function_call": {
+                            "name": call.get("function", {}).get("name"),
+                            "args": jsonio.loads(call.get("function", {}).get("arguments", "{}")),
+                        }
                     }
                 )
-                continue
+            return {"role": "model", "parts": parts}
+
+        if role == "tool":
+            return {
+                "role": "user",
+                "parts": [
+                    {
+                        "function_response": {
+                            "name": message.get("name"),
+                            "response": jsonio.loads(message.get("content", "{}")),
+                        }
+                    }
+                ],
+            }
 
-            contents.append({"role": "model" if role == "assistant" else "user", "parts": [{"text": message.get("content", "")}]})
-        return contents
+        return {"role": "model" if role == "assistant" else "user", "parts": [{"text": message.get("content", "")}]}
 
     def generate(self, messages: List[Dict[str, Any]], tools: List[Dict[str, Any]]) -> Dict[str, Any]:
-        model = self.genai.GenerativeModel(model_name=self.model, tools=self._build_tools(tools))
-        response = model.generate_content(self._to_contents(messages))
+        if tools is not self._tools:
+            self._generative_model = self.genai.GenerativeModel(model_name=self.model, tools=self._build_tools(tools))
+            self._tools = tools
+        response = self._generative_model.generate_content(self._history(messages))
         candidate = response.candidates[0]
         parts = candidate.content.parts
         for part in parts:
@@ -1,10 +1,15 @@
 from __future__ import annotations
 
-import json
-from typing import Any, Dict, List, Protocol
+import logging
+from collections import OrderedDict
+from typing import Any, Dict, List, Protocol, Tuple
+
+from src.data import jsonio
 
 from .types import AgentResponse, AgentTrace, ToolCall, ToolResult, ToolSpec
 
+logger = logging.getLogger(__name__)
+
 
 class LLMClient(Protocol):
     def generate(self, messages: List[Dict[str, Any]], tools: List[Dict[str, Any]]) -> Dict[str, Any]:
@@ -24,6 +29,32 @@ def build_tool_payloads(tool_specs: List[ToolSpec]) -> List[Dict[str, Any]]:
     return payloads
 
 
+# Tool specs are built once per process, so their derived payloads and name index are reused
+# across agent runs. Each entry keeps its specs alive, which keeps the id()-based keys valid.
+TOOL_INDEX_CACHE_SIZE = 8
+_TOOL_INDEX_CACHE: OrderedDict[Tuple[int, ...], Tuple[List[ToolSpec], List[Dict[str, Any]], Dict[str, ToolSpec]]] = (
+    OrderedDict()
+)
+
+
+def _tool_index(tool_specs: List[ToolSpec]) -> Tuple[List[Dict[str, Any]], Dict[str, ToolSpec]]:
+    key = tuple(id(tool) for tool in tool_specs)
+    cached = _TOOL_INDEX_CACHE.get(key)
+    if cached is None:
+        specs = list(tool_specs)
+        cached = (specs, build_tool_payloads(specs), {tool.name: tool for tool in specs})
+        _TOOL_INDEX_CACHE[key] = cached
+        if len(_TOOL_INDEX_CACHE) > TOOL_INDEX_CACHE_SIZE:
+            _TOOL_INDEX_CACHE.popitem(last=False)
+    else:
+        _TOOL_INDEX_CACHE.move_to_end(key)
+    return cached[1], cached[2]
+
+
+def _debug_event(event: str, name: str, field: str, encoded: str) -> str:
+    return f'{{"event": "{event}", "name": {jsonio.dumps(name)}, "{field}": {encoded}}}'
+
+
 def run_agent_loop(
     llm_client: LLMClient,
     system_prompt: str,
@@ -33,12 +64,17 @@ def run_agent_loop(
     max_tool_calls: int = 20,
     debug: bool = False,
 ) -> AgentResponse:
+    """Run the tool-calling loop until the model returns a final answer or a budget runs out.
+
+    Per-tool progress is logged at INFO (and payloads at DEBUG when `debug` is set) on the
+    `src.agent.runner` logger. Nothing is printed unless the caller configures logging, e.g.
+    `logging.basicConfig(level=logging.INFO)`; the CLI attaches its own stdout handler.
+    """
     messages: List[Dict[str, Any]] = [
         {"role": "system", "content": system_prompt},
         {"role": "user", "content": user_message},
     ]
-    tool_payloads = build_tool_payloads(tool_specs)
-    tools_by_name = {tool.name: tool for tool in tool_specs}
+    tool_payloads, tools_by_name = _tool_index(tool_specs)
     trace = AgentTrace()
     tool_calls_used = 0
     retried_invalid_json = False
@@ -90,14 +126,17 @@ def run_agent_loop(
         tool_calls_used += 1
 
         tool = tools_by_name[tool_name]
-        print(f"[tool {tool_calls_used}] {tool_name}")
-        if debug:
-            print(json.dumps({"event": "tool_call", "name": tool_name, "arguments": args}, ensure_ascii=False))
+        logger.info("[tool %d] %s", tool_calls_used, tool_name)
+        # Encode arguments and output once; the debug log and the transcript share the text.
+        arguments_json = jsonio.dumps(args)
+        if debug and logger.isEnabledFor(logging.DEBUG):
+            logger.debug("%s", _debug_event("tool_call", tool_name, "arguments", arguments_json))
 
         output = tool.handler(**args)
         trace.tool_results.append(ToolResult(name=tool_name, arguments=args, output=output, call_id=call_id))
-        if debug:
-            print(json.dumps({"event": "tool_result", "name": tool_name, "output": output}, ensure_ascii=False, default=str))
+        output_json = jsonio.dumps(output)
+        if debug and logger.isEnabledFor(logging.DEBUG):
+            logger.debug("%s", _debug_event("tool_result", tool_name, "output", output_json))
 
         messages.append(
             {
@@ -107,7 +146,7 @@ def run_agent_loop(
                     {
                         "id": call_id or "call_0",
                         "type": "function",
-                        "function": {"name": tool_name, "arguments": json.dumps(args)},
+                        "function": {"name": tool_name, "arguments": arguments_json},
                     }
                 ],
             }
@@ -117,7 +156,7 @@ def run_agent_loop(
                 "role": "tool",
                 "tool_call_id": call_id or "call_0",
                 "name": tool_name,
-                "content": json.dumps(output, ensure_ascii=False),
+                "content": output_json,
             }
         )
 
@@ -4,7 +4,7 @@ from dataclasses import dataclass, field
 from typing import Any, Callable, Dict, List, Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class ToolSpec:
     name: str
     description: str
@@ -12,14 +12,14 @@ class ToolSpec:
     handler: Callable[..., Any]
 
 
-@dataclass
+@dataclass(slots=True)
 class ToolCall:
     name: str
     arguments: Dict[str, Any]
     call_id: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class ToolResult:
     name: str
     arguments: Dict[str, Any]
@@ -27,13 +27,13 @@ class ToolResult:
     call_id: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class AgentTrace:
     tool_calls: List[ToolCall] = field(default_factory=list)
     tool_results: List[ToolResult] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class AgentResponse:
     final: Optional[Dict[str, Any]] = None
     trace: AgentTrace = field(default_factory=AgentTrace)
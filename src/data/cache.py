@@ -1,29 +1,110 @@
 from __future__ import annotations
 
 import hashlib
-import json
+import os
+import threading
+from collections import OrderedDict
 from pathlib import Path
 from typing import Any, Dict, Optional
 
+from src.data import jsonio
+
+try:
+    import xxhash
+except ImportError:  # optional speedup: pip install -e .[fast]
+    xxhash = None
+
+try:
+    import zstandard
+except ImportError:  # optional speedup: pip install -e .[fast]
+    zstandard = None
+
+# Bump when the on-disk layout or key hashing changes so stale entries are ignored, not misread.
+CACHE_VERSION = "v3"
+# Filenames only need to be unique, not collision-resistant against an adversary.
+KEY_HASH_NAME = "xxh3_128" if xxhash is not None else "blake2b_128"
+MEMORY_CACHE_ENTRIES = 512
+# NHL payloads repeat the same keys and team codes; level 3 shrinks them ~10x at negligible CPU cost.
+ZSTD_LEVEL = 3
+CORRUPT_ENTRY_ERRORS = (ValueError, zstandard.ZstdError) if zstandard is not None else (ValueError,)
+
+
+def hash_key(key: str) -> str:
+    data = key.encode("utf-8")
+    if xxhash is not None:
+        return xxhash.xxh3_128_hexdigest(data)
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
 
 class DiskCache:
-    def __init__(self, cache_dir: Optional[Path] = None) -> None:
+    """JSON files on disk, fronted by a bounded in-memory LRU of decoded payloads.
+
+    Payloads are returned by reference from the memory layer; callers must not mutate them.
+    """
+
+    def __init__(self, cache_dir: Optional[Path] = None, memory_entries: int = MEMORY_CACHE_ENTRIES) -> None:
         if cache_dir is None:
-            cache_dir = Path(__file__).resolve().parents[2] / ".cache" / "nhl_api"
+            cache_dir = Path(__file__).resolve().parents[2] / ".cache" / "nhl_api" / CACHE_VERSION / KEY_HASH_NAME
         self.cache_dir = cache_dir
         self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.memory_entries = memory_entries
+        self._memory: OrderedDict[str, Dict[str, Any]] = OrderedDict()
+        self._shards_created: set[Path] = set()
+        # get_json_many calls in from worker threads.
+        self._lock = threading.Lock()
 
     def _key_to_path(self, key: str) -> Path:
-        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
-        return self.cache_dir / f"{digest}.json"
+        # git-style fan-out: 256 shard directories keep each directory small.
+        digest = hash_key(key)
+        return self.cache_dir / digest[:2] / f"{digest[2:]}.json"
+
+    def _remember(self, key: str, value: Dict[str, Any]) -> None:
+        with self._lock:
+            self._memory[key] = value
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_entries:
+                self._memory.popitem(last=False)
 
     def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            value = self._memory.get(key)
+            if value is not None:
+                self._memory.move_to_end(key)
+                return value
         path = self._key_to_path(key)
-        if not path.exists():
-            return None
-        return json.loads(path.read_text(encoding="utf-8"))
+        # Compressed entries win; plain .json entries (e.g. written without zstandard) still load.
+        candidates = [path]
+        if zstandard is not None:
+            candidates.insert(0, path.with_name(f"{path.name}.zst"))
+        for candidate in candidates:
+            try:
+                data = candidate.read_bytes()
+            except FileNotFoundError:
+                continue
+            try:
+                if candidate is not path:
+                    data = zstandard.ZstdDecompressor().decompress(data)
+                value = jsonio.loads(data)
+            except CORRUPT_ENTRY_ERRORS:
+                # A corrupt entry (e.g. left by an older non-atomic write) is dropped and refetched.
+                candidate.unlink(missing_ok=True)
+                return None
+            self._remember(key, value)
+            return value
+        return None
 
     def set(self, key: str, value: Dict[str, Any]) -> None:
         path = self._key_to_path(key)
-        path.write_text(json.dumps(value, ensure_ascii=False), encoding="utf-8")
-
+        data = jsonio.dumps_bytes(value)
+        if zstandard is not None:
+            path = path.with_name(f"{path.name}.zst")
+            data = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+        shard = path.parent
+        if shard not in self._shards_created:
+            shard.mkdir(exist_ok=True)
+            self._shards_created.add(shard)
+        # Write beside the target and rename, so readers never see a partially written file.
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+        self._remember(key, value)
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+try:
+    import orjson
+except ImportError:  # optional speedup: pip install -e .[fast]
+    orjson = None
+
+
+def loads(data: str | bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def load_path(path: Path) -> Any:
+    return loads(path.read_bytes())
+
+
+def dumps_bytes(
+    value: Any,
+    indent: bool = False,
+    default: Optional[Callable[[Any], Any]] = None,
+    newline: bool = False,
+) -> bytes:
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        if newline:
+            option |= orjson.OPT_APPEND_NEWLINE
+        return orjson.dumps(value, default=default, option=option)
+    text = dumps(value, indent=indent, default=default)
+    return (text + "\n" if newline else text).encode("utf-8")
+
+
+def dumps(value: Any, indent: bool = False, default: Optional[Callable[[Any], Any]] = None) -> str:
+    if orjson is not None:
+        return dumps_bytes(value, indent=indent, default=default).decode("utf-8")
+    return json.dumps(value, default=default, indent=2 if indent else None, ensure_ascii=False)
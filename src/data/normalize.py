@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from functools import lru_cache
 from typing import Dict
 
 
@@ -9,9 +10,24 @@ ABBREV_OVERRIDES = {
     "NJ": "NJD",
     "SJ": "SJS",
 }
+# Codes the NHL API already uses; these are returned as-is without touching the override path.
+CANONICAL_TEAM_ABBREVS = frozenset(
+    {
+        "ANA", "ARI", "BOS", "BUF", "CAR", "CBJ", "CGY", "CHI", "COL", "DAL", "DET",
+        "EDM", "FLA", "LAK", "MIN", "MTL", "NJD", "NSH", "NYI", "NYR", "OTT", "PHI",
+        "PIT", "SEA", "SJS", "STL", "TBL", "TOR", "UTA", "VAN", "VGK", "WPG", "WSH",
+    }
+)
 
 
 def normalize_team_abbrev(abbrev: str) -> str:
+    if abbrev in CANONICAL_TEAM_ABBREVS:
+        return abbrev
+    return _normalize_team_abbrev(abbrev)
+
+
+@lru_cache(maxsize=128)
+def _normalize_team_abbrev(abbrev: str) -> str:
     abbrev = abbrev.strip().upper()
     return ABBREV_OVERRIDES.get(abbrev, abbrev)
 
@@ -24,6 +40,7 @@ def build_team_id_map(teams_payload: Dict) -> Dict[str, int]:
     return team_map
 
 
+@lru_cache(maxsize=128)
 def season_id_from_date(date_str: str) -> str:
     year_str, month_str, _ = date_str.split("-")
     year = int(year_str)
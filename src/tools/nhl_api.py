@@ -1,53 +1,258 @@
 from __future__ import annotations
 
-from typing import Any, Dict, Optional
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import date
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 from urllib.parse import urlencode
 
 import requests
+from requests.adapters import HTTPAdapter
 
+from src.data import jsonio
 from src.data.cache import DiskCache
+from src.data.normalize import season_id_from_date
 
+# Path segments that resolve to "whatever is current", so their payloads change over time.
+VOLATILE_SEGMENTS = frozenset({"now", "current"})
+DATE_PATTERN = re.compile(r"(?<!\d)\d{4}-\d{2}-\d{2}(?!\d)")
+# Season ids such as 20232024; the two years are checked to be consecutive before use.
+SEASON_PATTERN = re.compile(r"(?<!\d)(\d{4})(\d{4})(?!\d)")
+# gameState values after which a game's boxscore, landing and play-by-play no longer change.
+FINAL_GAME_STATES = frozenset({"FINAL", "OFF"})
+# Upper bound on parallel requests (and pooled connections) per client.
+MAX_CONCURRENT_REQUESTS = 16
+# Background workers for speculative fetches; kept small so prefetching never crowds out real calls.
+PREFETCH_WORKERS = 4
+REQUEST_TIMEOUT_SECONDS = 30.0
+# Speculative fetches give up sooner, so one still in flight cannot hold up interpreter exit for long.
+PREFETCH_TIMEOUT_SECONDS = 5.0
+# Volatile payloads are never written to disk, but repeat calls within this window reuse the last response.
+VOLATILE_TTL_SECONDS = 60.0
+VOLATILE_CACHE_ENTRIES = 256
 
-class NHLApiClient:
-    def __init__(self, base_url: str = "https://api-web.nhle.com/v1", cache: Optional[DiskCache] = None) -> None:
-        self.base_url = base_url.rstrip("/")
-        self.cache = cache or DiskCache()
 
-    def get_json(self, path: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-        params = params or {}
-        query = urlencode(sorted(params.items()))
-        url = f"{self.base_url}/{path.lstrip('/')}"
-        key = f"{url}?{query}"
+def _is_live_season(start: str, end: str, current_season: str) -> bool:
+    return int(end) == int(start) + 1 and start + end >= current_season
 
-        cached = self.cache.get(key)
-        if cached is not None:
-            return cached
 
-        response = requests.get(url, params=params, timeout=30)
-        response.raise_for_status()
-        payload = response.json()
-        self.cache.set(key, payload)
-        return payload
+def is_volatile_path(path: str, params: Optional[Dict[str, Any]] = None) -> bool:
+    """Return True when a response for `path` (and `params`) may still change and must not be cached on disk.
+
+    That is a "now"/"current" segment, a date from today on, or a season id of the running season or later,
+    either as a path segment or inside a query value such as a stats API cayenneExp filter.
+    """
+    today = date.today().isoformat()
+    current_season = season_id_from_date(today)
+    for segment in path.strip("/").split("/"):
+        if segment in VOLATILE_SEGMENTS:
+            return True
+        if DATE_PATTERN.fullmatch(segment) and segment >= today:
+            return True
+        season = SEASON_PATTERN.fullmatch(segment)
+        if season and _is_live_season(season[1], season[2], current_season):
+            return True
+    for value in (params or {}).values():
+        text = str(value)
+        if text in VOLATILE_SEGMENTS:
+            return True
+        if any(match[0] >= today for match in DATE_PATTERN.finditer(text)):
+            return True
+        if any(_is_live_season(match[1], match[2], current_season) for match in SEASON_PATTERN.finditer(text)):
+            return True
+    return False
+
+
+def is_unfinished_game_payload(payload: Any) -> bool:
+    """Return True for a gamecenter-style payload whose game can still change (scheduled or live)."""
+    if not isinstance(payload, dict):
+        return False
+    state = payload.get("gameState")
+    return state is not None and state not in FINAL_GAME_STATES
+
+
+def conditional_headers(response: requests.Response) -> Dict[str, str]:
+    """Request headers that ask the server to answer 304 if `response` is still current."""
+    headers: Dict[str, str] = {}
+    etag = response.headers.get("ETag")
+    if etag:
+        headers["If-None-Match"] = etag
+    last_modified = response.headers.get("Last-Modified")
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+    return headers
+
+
+_shared_session: Optional[requests.Session] = None
+_shared_session_lock = threading.Lock()
+
 
+def shared_session() -> requests.Session:
+    """Process-wide pooled session, so every client (and NHLTools instance) reuses warm TLS connections."""
+    global _shared_session
+    with _shared_session_lock:
+        if _shared_session is None:
+            session = requests.Session()
+            # One pool per NHL host (web and stats), each sized for get_json_many.
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=MAX_CONCURRENT_REQUESTS)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _shared_session = session
+        return _shared_session
 
-class NHLStatsApiClient:
-    def __init__(self, base_url: str = "https://api.nhle.com/stats/rest", cache: Optional[DiskCache] = None) -> None:
+
+_prefetch_executor: Optional[ThreadPoolExecutor] = None
+_prefetch_executor_lock = threading.Lock()
+
+
+def prefetch_executor() -> ThreadPoolExecutor:
+    global _prefetch_executor
+    with _prefetch_executor_lock:
+        if _prefetch_executor is None:
+            _prefetch_executor = ThreadPoolExecutor(max_workers=PREFETCH_WORKERS, thread_name_prefix="nhl-prefetch")
+            # concurrent.futures joins its workers (running every queued item) before atexit handlers run,
+            # so queued prefetches are cancelled from a threading exit hook, which runs ahead of that join.
+            threading._register_atexit(_cancel_prefetches)
+        return _prefetch_executor
+
+
+def _cancel_prefetches() -> None:
+    if _prefetch_executor is not None:
+        _prefetch_executor.shutdown(wait=False, cancel_futures=True)
+
+
+class _NHLJsonClient:
+    """Shared GET + disk-cache logic for the NHL web and stats APIs."""
+
+    def __init__(
+        self,
+        base_url: str,
+        cache: Optional[DiskCache] = None,
+        session: Optional[requests.Session] = None,
+    ) -> None:
         self.base_url = base_url.rstrip("/")
         self.cache = cache or DiskCache()
+        self.session = session or shared_session()
+        # In-flight requests and prefetches by path (plus query), so concurrent callers share one fetch.
+        self._pending: Dict[str, Future] = {}
+        self._pending_lock = threading.Lock()
+        # Memory copies of volatile responses: key -> (expires_at, payload, revalidation headers), oldest first.
+        # Expired entries stay until evicted so the next request can be conditional.
+        self._volatile: OrderedDict[str, Tuple[float, Dict[str, Any], Dict[str, str]]] = OrderedDict()
+        self._volatile_lock = threading.Lock()
 
     def get_json(self, path: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        flight = f"{path}?{urlencode(sorted(params.items()))}" if params else path
+        with self._pending_lock:
+            pending = self._pending.get(flight)
+            if pending is None:
+                future: Future = Future()
+                self._pending[flight] = future
+        if pending is not None:
+            try:
+                return pending.result()
+            except Exception:
+                # A failed prefetch or concurrent request is retried as an ordinary request.
+                return self._fetch_json(path, params)
+
+        try:
+            payload = self._fetch_json(path, params)
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        else:
+            future.set_result(payload)
+            return payload
+        finally:
+            self._forget_pending(flight)
+
+    def _fetch_json(
+        self,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        timeout: float = REQUEST_TIMEOUT_SECONDS,
+    ) -> Dict[str, Any]:
         params = params or {}
         query = urlencode(sorted(params.items()))
         url = f"{self.base_url}/{path.lstrip('/')}"
         key = f"{url}?{query}"
+        cacheable = not is_volatile_path(path, params)
 
-        cached = self.cache.get(key)
+        cached = self.cache.get(key) if cacheable else None
+        if cached is not None and is_unfinished_game_payload(cached):
+            cached = None  # saved mid-game before this check existed; fetch the settled version
         if cached is not None:
             return cached
+        with self._volatile_lock:
+            entry = self._volatile.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            return entry[1]
 
-        response = requests.get(url, params=params, timeout=30)
-        response.raise_for_status()
-        payload = response.json()
-        self.cache.set(key, payload)
+        # An expired volatile entry is revalidated; a 304 reuses its payload without resending the body.
+        response = self.session.get(url, params=params, headers=entry[2] if entry else None, timeout=timeout)
+        if entry is not None and response.status_code == 304:
+            payload = entry[1]
+        else:
+            response.raise_for_status()
+            # Parse the raw body with orjson when available instead of requests' stdlib-based .json().
+            payload = jsonio.loads(response.content)
+        if cacheable and not is_unfinished_game_payload(payload):
+            self.cache.set(key, payload)
+        else:
+            self._set_volatile(key, payload, conditional_headers(response) or (entry[2] if entry else {}))
         return payload
 
+    def _set_volatile(self, key: str, payload: Dict[str, Any], validators: Dict[str, str]) -> None:
+        with self._volatile_lock:
+            # Every entry shares one TTL, so insertion order is expiry order.
+            self._volatile.pop(key, None)
+            self._volatile[key] = (time.monotonic() + VOLATILE_TTL_SECONDS, payload, validators)
+            while len(self._volatile) > VOLATILE_CACHE_ENTRIES:
+                self._volatile.popitem(last=False)
+
+    def prefetch(self, paths: Sequence[str]) -> None:
+        """Warm the cache for parameterless paths a caller is likely to request next."""
+        for path in paths:
+            if is_volatile_path(path):
+                continue
+            with self._pending_lock:
+                if path in self._pending:
+                    continue
+                future = prefetch_executor().submit(self._fetch_json, path, timeout=PREFETCH_TIMEOUT_SECONDS)
+                self._pending[path] = future
+            future.add_done_callback(lambda _, path=path: self._forget_pending(path))
+
+    def _forget_pending(self, flight: str) -> None:
+        # The payload now lives in the cache, which serves any later request.
+        with self._pending_lock:
+            self._pending.pop(flight, None)
+
+    def get_json_many(self, paths: Sequence[str]) -> List[Dict[str, Any]]:
+        """Fetch several parameterless paths concurrently; results keep the order of `paths`."""
+        if len(paths) <= 1:
+            return [self.get_json(path) for path in paths]
+        with ThreadPoolExecutor(max_workers=min(MAX_CONCURRENT_REQUESTS, len(paths))) as executor:
+            return list(executor.map(self.get_json, paths))
+
+
+class NHLApiClient(_NHLJsonClient):
+    def __init__(
+        self,
+        base_url: str = "https://api-web.nhle.com/v1",
+        cache: Optional[DiskCache] = None,
+        session: Optional[requests.Session] = None,
+    ) -> None:
+        super().__init__(base_url, cache, session)
+
+
+class NHLStatsApiClient(_NHLJsonClient):
+    def __init__(
+        self,
+        base_url: str = "https://api.nhle.com/stats/rest",
+        cache: Optional[DiskCache] = None,
+        session: Optional[requests.Session] = None,
+    ) -> None:
+        super().__init__(base_url, cache, session)
@@ -1,11 +1,15 @@
 from __future__ import annotations
 
-import json
+import heapq
 import re
-from datetime import date, datetime
+import sys
+from collections import OrderedDict
+from datetime import date
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Sequence
+from typing import Any, Dict, List, Sequence, Tuple
 
+from src.data import jsonio
 from src.data.normalize import normalize_team_abbrev, season_id_from_date
 from src.tools.nhl_api import NHLApiClient, NHLStatsApiClient
 from src.agent.types import ToolSpec
@@ -118,8 +122,7 @@ DEFAULT_ENDPOINT_CATALOG: List[Dict[str, Any]] = [
 
 
 def _load_json_catalog(path: Path) -> List[Dict[str, Any]]:
-    with path.open("r", encoding="utf-8") as handle:
-        data = json.load(handle)
+    data = jsonio.load_path(path)
     if not isinstance(data, list):
         raise ValueError(f"Catalog at {path} must be a list of endpoints.")
     return data
@@ -129,44 +132,52 @@ def _merge_catalogs(
     base_catalog: List[Dict[str, Any]],
     overrides: List[Dict[str, Any]],
 ) -> List[Dict[str, Any]]:
+    # One shallow copy per entry; overrides then update those copies in place.
     merged = [dict(item) for item in base_catalog]
-    index_by_path = {item.get("path"): i for i, item in enumerate(merged) if item.get("path")}
-    index_by_name = {item.get("name"): i for i, item in enumerate(merged) if item.get("name")}
+    # One index for both lookups; the "path"/"name" tag keeps a path and a name with equal text apart.
+    index: Dict[Tuple[str, Any], int] = {}
+    for i, item in enumerate(merged):
+        for field in ("path", "name"):
+            value = item.get(field)
+            if value:
+                index[(field, value)] = i
 
     for override in overrides:
         if not isinstance(override, dict):
             continue
-        key = override.get("path")
-        idx = index_by_path.get(key) if key else None
+        idx = index.get(("path", override.get("path")))
         if idx is None:
-            key = override.get("name")
-            idx = index_by_name.get(key) if key else None
+            idx = index.get(("name", override.get("name")))
 
         if idx is None:
             merged.append(dict(override))
             continue
 
-        updated = dict(merged[idx])
+        entry = merged[idx]
         for field, value in override.items():
             if (
                 field == "params_schema"
                 and isinstance(value, dict)
-                and isinstance(updated.get("params_schema"), dict)
+                and isinstance(entry.get("params_schema"), dict)
+                and value is not entry["params_schema"]
             ):
-                params_schema = dict(updated["params_schema"])
+                # The nested schema is still shared with base_catalog, so it is copied before merging.
+                params_schema = dict(entry["params_schema"])
                 for subfield, subvalue in value.items():
                     if isinstance(subvalue, dict) and isinstance(params_schema.get(subfield), dict):
                         params_schema[subfield] = {**params_schema[subfield], **subvalue}
                     else:
                         params_schema[subfield] = subvalue
-                updated["params_schema"] = params_schema
+                entry["params_schema"] = params_schema
             else:
-                updated[field] = value
-        merged[idx] = updated
+                entry[field] = value
 
     return merged
 
 
+CATALOG_INTERNED_FIELDS = ("base", "category", "name", "path")
+
+
 def load_endpoint_catalog() -> List[Dict[str, Any]]:
     base_dir = Path(__file__).resolve().parent
     generated_path = base_dir / "endpoint_catalog.generated.json"
@@ -184,13 +195,48 @@ def load_endpoint_catalog() -> List[Dict[str, Any]]:
         overrides = _load_json_catalog(overrides_path)
         catalog = _merge_catalogs(catalog, overrides)
 
+    # Interned once here so every tool response echoing these fields shares the catalog's strings.
+    for entry in catalog:
+        for field in CATALOG_INTERNED_FIELDS:
+            value = entry.get(field)
+            if isinstance(value, str):
+                entry[field] = sys.intern(value)
     return catalog
 
 
-ENDPOINT_CATALOG: List[Dict[str, Any]] = load_endpoint_catalog()
+def _group_by_category(catalog: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+    grouped: Dict[str, List[Dict[str, Any]]] = {}
+    for entry in catalog:
+        category = entry.get("category")
+        if isinstance(category, str):
+            grouped.setdefault(category, []).append(entry)
+    return grouped
 
 
-DATE_PATTERN = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+ENDPOINT_CATALOG: List[Dict[str, Any]] = load_endpoint_catalog()
+# Lookup indexes over the catalog, built once; the first entry for a path decides its category.
+ALLOWED_PATH_TEMPLATES = frozenset(e["path"] for e in ENDPOINT_CATALOG if e.get("path"))
+CATEGORY_BY_PATH: Dict[str, Any] = {e["path"]: e.get("category") for e in reversed(ENDPOINT_CATALOG) if e.get("path")}
+ENDPOINTS_BY_CATEGORY: Dict[str, List[Dict[str, Any]]] = _group_by_category(ENDPOINT_CATALOG)
+
+
+DATE_PATTERN = re.compile(r"^\d{4}-\d{2}-\d{2}$", re.ASCII)
+TOI_PATTERN = re.compile(r"(?:(\d+):)?(\d+):(\d+)")
+# Same test as `"/now" in p or p.endswith("now")` (and likewise for "current"), in one scan.
+NOW_OR_CURRENT_PATTERN = re.compile(r"/(?:now|current)|(?:now|current)\Z")
+# The agent only ever looks at the first few matches for a name.
+MAX_SEARCH_CANDIDATES = 10
+# Sorts above any time suffix ("T19:00:00Z"), so `end_date + DATE_UPPER_SENTINEL` is an exclusive
+# upper bound that raw API timestamps can be compared against without slicing them first.
+DATE_UPPER_SENTINEL = "~"
+# Per-NHLTools bound on remembered game dates (a full season is ~1,400 games).
+GAME_DATE_CACHE_ENTRIES = 4096
+# Roster groups under playerByGameStats.<homeTeam|awayTeam> in gamecenter boxscores.
+BOXSCORE_PLAYER_GROUPS = ("forwards", "defense", "goalies", "skaters")
+# Keys checked, in order, for the date of a payload entry when filtering by as_of_date.
+PAYLOAD_DATE_KEYS = ("gameDate", "date", "gameDay", "startDate", "endDate")
+# Requests the agent usually makes right after a player search, warmed for the top candidate.
+SEARCH_PREFETCH_TEMPLATES = ("player/{player_id}/game-log/{season_id}/2",)
 
 DEFAULT_FANTASY_SCORING: Dict[str, float] = {
     "goals": 2.0,
@@ -223,11 +269,27 @@ FANTASY_STAT_ALIASES: Dict[str, str] = {
 }
 
 
+@lru_cache(maxsize=256)
+def _is_now_or_current(path_template: str) -> bool:
+    # Templates come from the small endpoint catalog, so most calls are a cache hit.
+    return NOW_OR_CURRENT_PATTERN.search(path_template) is not None
+
+
 def _parse_date(value: str) -> date | None:
-    if not isinstance(value, str) or not DATE_PATTERN.match(value):
+    # Tool arguments can be any JSON type (lists are unhashable); reject non-strings before the cache.
+    if not isinstance(value, str):
+        return None
+    return _parse_date_str(value)
+
+
+@lru_cache(maxsize=4096)
+def _parse_date_str(value: str) -> date | None:
+    # Payload filtering re-parses the same few game dates thousands of times.
+    # The length check rejects a trailing newline, which `$` in DATE_PATTERN would allow.
+    if len(value) != 10 or not DATE_PATTERN.match(value):
         return None
     try:
-        return datetime.strptime(value, "%Y-%m-%d").date()
+        return date(int(value[:4]), int(value[5:7]), int(value[8:]))
     except ValueError:
         return None
 
@@ -244,20 +306,11 @@ def _coerce_float(value: Any) -> float | None:
 def _parse_toi_to_seconds(value: Any) -> int:
     if value is None:
         return 0
-    text = str(value).strip()
-    if not text:
-        return 0
-    parts = text.split(":")
-    try:
-        if len(parts) == 2:
-            minutes, seconds = parts
-            return int(minutes) * 60 + int(seconds)
-        if len(parts) == 3:
-            hours, minutes, seconds = parts
-            return int(hours) * 3600 + int(minutes) * 60 + int(seconds)
-    except ValueError:
+    match = TOI_PATTERN.fullmatch(str(value).strip())
+    if not match:
         return 0
-    return 0
+    hours, minutes, seconds = match.groups()
+    return int(hours or 0) * 3600 + int(minutes) * 60 + int(seconds)
 
 
 def _normalize_scoring_rules(scoring: Dict[str, Any] | None) -> Dict[str, float] | None:
@@ -267,7 +320,9 @@ def _normalize_scoring_rules(scoring: Dict[str, Any] | None) -> Dict[str, float]
         return None
     normalized = dict(DEFAULT_FANTASY_SCORING)
     for key, value in scoring.items():
-        stat = FANTASY_STAT_ALIASES.get(str(key), str(key))
+        key = str(key)
+        # Caller-supplied names become keys of every player's stat_totals; intern them like the defaults.
+        stat = sys.intern(FANTASY_STAT_ALIASES.get(key, key))
         weight = _coerce_float(value)
         if weight is None:
             return None
@@ -275,15 +330,106 @@ def _normalize_scoring_rules(scoring: Dict[str, Any] | None) -> Dict[str, float]
     return normalized
 
 
+def _leaders_params(categories: Sequence[str], limit: int) -> Dict[str, Any]:
+    # Shared query for the skater and goalie stats-leaders endpoints.
+    return {"categories": ",".join(categories), "limit": limit}
+
+
+def _positional_rank(results: List[Dict[str, Any]], player_id: Any) -> Tuple[int, Dict[str, Any]] | None:
+    """Return (rank, entry) for `player_id`'s first entry in `results`, or None when it was not scored.
+
+    The rank is the 1-based position in the stable descending order that heapq.nlargest cuts the
+    top slice from, so a tied player gets the same rank whether or not it lands inside the slice.
+    """
+    for index, entry in enumerate(results):
+        if entry.get("player_id") == player_id:
+            break
+    else:
+        return None
+    points = entry.get("fantasy_points", 0)
+    # Equal scores listed earlier sort ahead of the player; later ones only if strictly better.
+    ahead = sum(1 for other in results[:index] if other.get("fantasy_points", 0) >= points)
+    ahead += sum(1 for other in results[index + 1 :] if other.get("fantasy_points", 0) > points)
+    return ahead + 1, entry
+
+
+class _PathParams(dict):
+    # Tokens without a matching param are left in the path as-is.
+    def __missing__(self, key: str) -> str:
+        return "{" + key + "}"
+
+
 def _format_path(path_template: str, path_params: Dict[str, Any]) -> str:
     """Format a catalog path template with path params.
 
     Only replaces `{key}` tokens present in the template.
     """
-    out = path_template
-    for k, v in path_params.items():
-        out = out.replace("{" + k + "}", str(v))
-    return out
+    return _format_path_cached(path_template, tuple(sorted((str(k), str(v)) for k, v in path_params.items())))
+
+
+@lru_cache(maxsize=1024)
+def _format_path_cached(path_template: str, items: Tuple[Tuple[str, str], ...]) -> str:
+    # Agents re-request the same few paths (scoreboard/{date}, team schedules) within a session.
+    return path_template.format_map(_PathParams(items))
+
+
+# Copy-on-write: a container is only rebuilt when something inside it was dropped, so untouched
+# subtrees (usually most of the payload) are shared with the cached original.
+def _filter_value(value: Any, cutoff: str) -> Any:
+    if isinstance(value, list):
+        return _filter_list(value, cutoff)
+    if isinstance(value, dict):
+        filtered: Dict[str, Any] | None = None
+        for key, child in value.items():
+            # Scalars can never be filtered, so they are not descended into.
+            if not isinstance(child, (list, dict)):
+                continue
+            new_child = _filter_value(child, cutoff)
+            if new_child is not child:
+                if filtered is None:
+                    filtered = dict(value)
+                filtered[key] = new_child
+        return value if filtered is None else filtered
+    return value
+
+
+def _date_after(text: str, cutoff: str) -> bool:
+    # ISO dates order like strings, so only values past the cutoff need the (cached) calendar check.
+    return text > cutoff and _parse_date(text) is not None
+
+
+def _item_after(item: Dict[str, Any], cutoff: str) -> bool:
+    # The first key holding a valid date decides, as before.
+    for key in PAYLOAD_DATE_KEYS:
+        if key in item:
+            text = str(item[key])[:10]
+            if text > cutoff:
+                if _parse_date(text) is not None:
+                    return True
+            elif _parse_date(text) is not None:
+                return False
+    return False
+
+
+def _filter_list(items: List[Any], cutoff: str) -> List[Any]:
+    filtered: List[Any] | None = None
+    for index, entry in enumerate(items):
+        if isinstance(entry, dict):
+            keep = not _item_after(entry, cutoff)
+            new_entry = _filter_value(entry, cutoff) if keep else entry
+        elif isinstance(entry, str):
+            keep = not _date_after(entry[:10], cutoff)
+            new_entry = entry
+        else:
+            keep = True
+            new_entry = _filter_value(entry, cutoff) if isinstance(entry, list) else entry
+        if filtered is None:
+            if keep and new_entry is entry:
+                continue
+            filtered = items[:index]
+        if keep:
+            filtered.append(new_entry)
+    return items if filtered is None else filtered
 
 
 class NHLTools:
@@ -292,14 +438,18 @@ class NHLTools:
         client: NHLApiClient | None = None,
         stats_client: NHLStatsApiClient | None = None,
         as_of_date: str | None = None,
+        prefetch_search_results: bool = False,
     ) -> None:
         self.client = client or NHLApiClient()
         self.stats_client = stats_client or NHLStatsApiClient()
         self.as_of_date = as_of_date
+        # Opt-in: search_player warms the top hit's game log in the background (see _prefetch_for_player).
+        self.prefetch_search_results = prefetch_search_results
+        # game_id -> game date, so as-of checks don't re-read the landing payload for every call.
+        self._game_dates: OrderedDict[str, date] = OrderedDict()
 
     def _allow_future_dates(self, path_template: str) -> bool:
-        entry = next((item for item in ENDPOINT_CATALOG if item.get("path") == path_template), None)
-        return (entry or {}).get("category") == "schedule"
+        return CATEGORY_BY_PATH.get(path_template) == "schedule"
 
     def _enforce_as_of_date(
         self, path_template: str, path_params: Dict[str, Any], query_params: Dict[str, Any]
@@ -318,12 +468,7 @@ class NHLTools:
         if self._allow_future_dates(path_template):
             return None
 
-        if (
-            "/now" in path_template
-            or path_template.endswith("now")
-            or "/current" in path_template
-            or path_template.endswith("current")
-        ):
+        if _is_now_or_current(path_template):
             return {
                 "error": "as_of_date_violation",
                 "message": "Endpoints using /now or /current are not allowed when as_of_date is set.",
@@ -350,10 +495,10 @@ class NHLTools:
                     "game_date": game_date.isoformat(),
             }
 
+        cutoff_iso = cutoff.isoformat()
         for source_name, params in (("path_params", path_params), ("query_params", query_params)):
             for key, value in params.items():
-                parsed = _parse_date(str(value))
-                if parsed and parsed > cutoff:
+                if _date_after(str(value), cutoff_iso):
                     return {
                         "error": "as_of_date_violation",
                         "message": f"{source_name}.{key} is after as_of_date.",
@@ -364,6 +509,10 @@ class NHLTools:
         return None
 
     def _get_game_date_for_game_id(self, game_id: str) -> date | None:
+        cached = self._game_dates.get(game_id)
+        if cached is not None:
+            self._game_dates.move_to_end(game_id)
+            return cached
         try:
             payload = self.client.get_json(f"gamecenter/{game_id}/landing")
         except Exception:
@@ -376,6 +525,10 @@ class NHLTools:
                 continue
             parsed = _parse_date(str(value)[:10])
             if parsed:
+                # Only found dates are kept; a failed lookup is retried next time.
+                self._game_dates[game_id] = parsed
+                if len(self._game_dates) > GAME_DATE_CACHE_ENTRIES:
+                    self._game_dates.popitem(last=False)
                 return parsed
         return None
 
@@ -407,18 +560,26 @@ class NHLTools:
                 }
         return None
 
+    def _get_json_many(self, paths: List[str]) -> List[Any]:
+        # NHLApiClient fetches concurrently; an injected client that only has get_json is read path by path.
+        get_json_many = getattr(self.client, "get_json_many", None)
+        if get_json_many is None:
+            return [self.client.get_json(path) for path in paths]
+        return get_json_many(paths)
+
     def _collect_game_ids_for_week(self, start_date: str, end_date: str) -> List[int]:
         payload = self.client.get_json(f"schedule/{start_date}")
-        game_ids: List[int] = []
+        end_bound = end_date + DATE_UPPER_SENTINEL
+        # Insertion-ordered dict as an ordered set: de-duplicates in the same pass.
+        game_ids: Dict[int, None] = {}
         for day in payload.get("gameWeek", []):
-            date_str = (day.get("date") or "")[:10]
-            if not (start_date <= date_str <= end_date):
+            if not (start_date <= (day.get("date") or "") < end_bound):
                 continue
             for game in day.get("games", []):
                 game_id = game.get("id") or game.get("gameId") or game.get("gamePk")
                 if game_id is not None:
-                    game_ids.append(int(game_id))
-        return list(dict.fromkeys(game_ids))
+                    game_ids[int(game_id)] = None
+        return list(game_ids)
 
     def _filter_payload_as_of(self, payload: Any, path_template: str) -> Any:
         if not self.as_of_date:
@@ -428,45 +589,13 @@ class NHLTools:
         cutoff = _parse_date(self.as_of_date)
         if cutoff is None:
             return payload
-
-        def filter_value(value: Any) -> Any:
-            if isinstance(value, list):
-                return filter_list(value)
-            if isinstance(value, dict):
-                return {k: filter_value(v) for k, v in value.items()}
-            return value
-
-        def item_date(item: Dict[str, Any]) -> date | None:
-            for key in ("gameDate", "date", "gameDay", "startDate", "endDate"):
-                if key in item:
-                    parsed = _parse_date(str(item[key])[:10])
-                    if parsed:
-                        return parsed
-            return None
-
-        def filter_list(items: List[Any]) -> List[Any]:
-            filtered: List[Any] = []
-            for entry in items:
-                if isinstance(entry, dict):
-                    parsed = item_date(entry)
-                    if parsed and parsed > cutoff:
-                        continue
-                    filtered.append(filter_value(entry))
-                elif isinstance(entry, str):
-                    parsed = _parse_date(entry[:10])
-                    if parsed and parsed > cutoff:
-                        continue
-                    filtered.append(entry)
-                else:
-                    filtered.append(filter_value(entry))
-            return filtered
-
-        return filter_value(payload)
+        return _filter_value(payload, cutoff.isoformat())
 
     def nhl_api_list_endpoints(self, category: str | None = None) -> Dict[str, Any]:
         """Return the allowed endpoint catalog for agent discovery."""
         if category:
-            filtered = [e for e in ENDPOINT_CATALOG if e.get("category") == category]
+            # Categories are strings; anything else (e.g. a list from the model) matches nothing.
+            filtered = ENDPOINTS_BY_CATEGORY.get(category, []) if isinstance(category, str) else []
             return {"endpoints": filtered}
         return {"endpoints": ENDPOINT_CATALOG}
 
@@ -493,8 +622,7 @@ class NHLTools:
         if as_of_error:
             return as_of_error
 
-        allowed_templates = {e["path"] for e in ENDPOINT_CATALOG}
-        if path_template not in allowed_templates:
+        if path_template not in ALLOWED_PATH_TEMPLATES:
             return {
                 "error": "path_template_not_allowed",
                 "message": "This endpoint is not in the allowed catalog.",
@@ -550,10 +678,12 @@ class NHLTools:
         total_points = 0.0
         games = []
 
+        end_bound = end_date + DATE_UPPER_SENTINEL
         for split in splits:
-            game_date = (split.get("gameDate") or split.get("date") or "")[:10]
-            if not (start_date <= game_date <= end_date):
+            raw_date = split.get("gameDate") or split.get("date") or ""
+            if not (start_date <= raw_date < end_bound):
                 continue
+            game_date = raw_date[:10]
             stat_line = split.get("stat", split)
             game_stats = {}
             for stat, weight in scoring_rules.items():
@@ -590,6 +720,7 @@ class NHLTools:
         end_date: str,
         scoring: Dict[str, Any] | None = None,
         top_n: int = 10,
+        rank_player_id: int | None = None,
     ) -> Dict[str, Any]:
         scoring_rules = _normalize_scoring_rules(scoring)
         if scoring_rules is None:
@@ -603,6 +734,10 @@ class NHLTools:
         if date_error:
             return date_error
 
+        # Fetch every game log concurrently first; the per-player scoring below then reads the cache.
+        season_id = season_id_from_date(end_date)
+        self._get_json_many([f"player/{player_id}/game-log/{season_id}/2" for player_id in dict.fromkeys(player_ids)])
+
         results = []
         for player_id in player_ids:
             result = self.fantasy_score_player_week(
@@ -615,14 +750,26 @@ class NHLTools:
                 continue
             results.append(result)
 
-        results.sort(key=lambda r: r.get("fantasy_points", 0), reverse=True)
-        return {
+        # Only the top slice is returned; nlargest matches sorted(reverse=True)[:n], ties included.
+        top_results = heapq.nlargest(max(1, top_n), results, key=lambda r: r.get("fantasy_points", 0))
+        response = {
             "start_date": start_date,
             "end_date": end_date,
             "scoring": scoring_rules,
             "top_n": top_n,
-            "results": results[: max(1, top_n)],
+            "results": top_results,
         }
+        if rank_player_id is not None:
+            # Lets evaluators rank a player that falls outside the returned top slice.
+            ranked = _positional_rank(results, rank_player_id)
+            if ranked is not None:
+                rank, target = ranked
+                response["ranked_player"] = {
+                    "player_id": rank_player_id,
+                    "fantasy_points": target.get("fantasy_points"),
+                    "rank": rank,
+                }
+        return response
 
     def fantasy_best_players_week_from_games(
         self,
@@ -647,30 +794,34 @@ class NHLTools:
         game_ids = self._collect_game_ids_for_week(start_date, end_date)
         player_totals: Dict[int, Dict[str, Any]] = {}
 
-        for game_id in game_ids:
-            boxscore = self.client.get_json(f"gamecenter/{game_id}/boxscore")
-            player_stats = boxscore.get("playerByGameStats", {})
-            for team_key in ("homeTeam", "awayTeam"):
-                team = player_stats.get(team_key, {})
-                for group_key in ("forwards", "defense", "goalies", "skaters"):
-                    for player in team.get(group_key, []) or []:
+        boxscores = self._get_json_many([f"gamecenter/{game_id}/boxscore" for game_id in game_ids])
+        for game_id, boxscore in zip(game_ids, boxscores):
+            player_stats = boxscore.get("playerByGameStats") or {}
+            for team in (player_stats.get("homeTeam") or {}, player_stats.get("awayTeam") or {}):
+                for group_key in BOXSCORE_PLAYER_GROUPS:
+                    for player in team.get(group_key) or ():
                         player_id = player.get("playerId") or player.get("id")
                         if player_id is None:
                             continue
                         toi = player.get("toi") or player.get("timeOnIce")
                         if _parse_toi_to_seconds(toi) < min_toi_seconds:
                             continue
-                        entry = player_totals.setdefault(
-                            int(player_id),
-                            {
-                                "player_id": int(player_id),
+                        player_id = int(player_id)
+                        entry = player_totals.get(player_id)
+                        if entry is None:
+                            entry = player_totals[player_id] = {
+                                "player_id": player_id,
                                 "name": player.get("name") or player.get("fullName"),
                                 "team": player.get("teamAbbrev"),
-                                "games": set(),
+                                "games_played": 0,
+                                "last_game_id": None,
                                 "stat_totals": {stat: 0.0 for stat in scoring_rules},
-                            },
-                        )
-                        entry["games"].add(game_id)
+                            }
+                        # game_ids are unique and processed in order, so a change of game id
+                        # marks a new game even if the player is listed in several groups.
+                        if entry["last_game_id"] != game_id:
+                            entry["last_game_id"] = game_id
+                            entry["games_played"] += 1
                         stat_line = player.get("stat", player)
                         for stat in scoring_rules:
                             value = _coerce_float(stat_line.get(stat))
@@ -687,7 +838,7 @@ class NHLTools:
                     "player_id": entry["player_id"],
                     "name": entry.get("name"),
                     "team": entry.get("team"),
-                    "games_played": len(entry["games"]),
+                    "games_played": entry["games_played"],
                     "fantasy_points": round(fantasy_points, 3),
                     "stat_totals": {k: round(v, 3) for k, v in totals.items()},
                     "scoring": scoring_rules,
@@ -709,7 +860,11 @@ class NHLTools:
         payload = self.client.get_json(f"player-search/{name}")
         candidates = []
         for person in payload.get("players", payload.get("data", [])):
-            team_abbrev = person.get("teamAbbrev") or person.get("teamAbbrev", {}).get("default")
+            if len(candidates) >= MAX_SEARCH_CANDIDATES:
+                break
+            team_abbrev = person.get("teamAbbrev")
+            if isinstance(team_abbrev, dict):
+                team_abbrev = team_abbrev.get("default")
             candidates.append(
                 {
                     "player_id": person.get("playerId") or person.get("id"),
@@ -717,8 +872,22 @@ class NHLTools:
                     "team_abbrev": team_abbrev,
                 }
             )
+        if self.prefetch_search_results and candidates:
+            self._prefetch_for_player(candidates[0]["player_id"])
         return {"candidates": candidates}
 
+    def _prefetch_for_player(self, player_id: Any) -> None:
+        # Best effort: a speculative fetch must never make the search itself fail.
+        prefetch = getattr(self.client, "prefetch", None)
+        as_of = _parse_date(self.as_of_date) if self.as_of_date else None
+        if prefetch is None or player_id is None or as_of is None:
+            return
+        season_id = season_id_from_date(as_of.isoformat())
+        # The running season's log still changes; only finished seasons are worth warming into the disk cache.
+        if season_id >= season_id_from_date(date.today().isoformat()):
+            return
+        prefetch([template.format(player_id=player_id, season_id=season_id) for template in SEARCH_PREFETCH_TEMPLATES])
+
     def get_player_info(self, player_id: int) -> Dict[str, Any]:
         payload = self.client.get_json(f"player/{player_id}/landing")
         return payload
@@ -731,14 +900,21 @@ class NHLTools:
         )
 
         games: List[Dict[str, Any]] = []
+        end_bound = end_date + DATE_UPPER_SENTINEL
         for game in payload.get("games", []):
-            game_date = (game.get("gameDate") or game.get("date") or "")[:10]
-            if not (start_date <= game_date <= end_date):
+            raw_date = game.get("gameDate") or game.get("date") or ""
+            if not (start_date <= raw_date < end_bound):
                 continue
-            home_team = (game.get("homeTeam") or {}).get("abbrev") or (game.get("homeTeam") or {}).get("abbreviation")
-            away_team = (game.get("awayTeam") or {}).get("abbrev") or (game.get("awayTeam") or {}).get("abbreviation")
+            game_date = raw_date[:10]
+            # Only games inside the window reach here; resolve each side's abbreviation once.
+            home = game.get("homeTeam") or {}
+            home_team = home.get("abbrev") or home.get("abbreviation")
             is_home = normalize_team_abbrev(home_team or "") == team_abbrev
-            opponent = away_team if is_home else home_team
+            if is_home:
+                away = game.get("awayTeam") or {}
+                opponent = away.get("abbrev") or away.get("abbreviation")
+            else:
+                opponent = home_team
             games.append(
                 {
                     "date": game_date,
@@ -770,10 +946,12 @@ class NHLTools:
 
         splits = payload.get("gameLog", payload.get("games", []))
         logs = []
+        end_bound = end_date + DATE_UPPER_SENTINEL
         for split in splits:
-            game_date = (split.get("gameDate") or split.get("date") or "")[:10]
-            if not (start_date <= game_date <= end_date):
+            raw_date = split.get("gameDate") or split.get("date") or ""
+            if not (start_date <= raw_date < end_bound):
                 continue
+            game_date = raw_date[:10]
             stat = split.get("stat", split)
             logs.append(
                 {
@@ -794,14 +972,14 @@ class NHLTools:
         return {"player_id": player_id, "games": payload.get("gameLog", payload.get("games", []))}
 
     def get_skater_stats_leaders_current(self, categories: Sequence[str], limit: int = 10) -> Dict[str, Any]:
-        params = {"categories": ",".join(categories), "limit": limit}
+        params = _leaders_params(categories, limit)
         payload = self.client.get_json("skater-stats-leaders/current", params=params)
         return payload
 
     def get_skater_stats_leaders_season(
         self, season_id: str, game_type: int, categories: Sequence[str], limit: int = 10
     ) -> Dict[str, Any]:
-        params = {"categories": ",".join(categories), "limit": limit}
+        params = _leaders_params(categories, limit)
         payload = self.client.get_json(
             f"skater-stats-leaders/{season_id}/{game_type}",
             params=params,
@@ -809,14 +987,14 @@ class NHLTools:
         return payload
 
     def get_goalie_stats_leaders_current(self, categories: Sequence[str], limit: int = 10) -> Dict[str, Any]:
-        params = {"categories": ",".join(categories), "limit": limit}
+        params = _leaders_params(categories, limit)
         payload = self.client.get_json("goalie-stats-leaders/current", params=params)
         return payload
 
     def get_goalie_stats_leaders_season(
         self, season_id: str, game_type: int, categories: Sequence[str], limit: int = 10
     ) -> Dict[str, Any]:
-        params = {"categories": ",".join(categories), "limit": limit}
+        params = _leaders_params(categories, limit)
         payload = self.client.get_json(
             f"goalie-stats-leaders/{season_id}/{game_type}",
             params=params,
@@ -915,15 +1093,61 @@ class NHLTools:
         return self.stats_client.get_json("en/season")
 
 
+# JSON schemas for the tool parameters; built once and shared by every ToolSpec list.
+LIST_ENDPOINTS_PARAMETERS: Dict[str, Any] = {
+    "type": "object",
+    "properties": {"category": {"type": "string"}},
+}
+NHL_API_CALL_PARAMETERS: Dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "base": {"type": "string", "enum": ["web", "stats"]},
+        "path_template": {"type": "string"},
+        "path_params": {"type": "object"},
+        "query_params": {"type": "object"},
+    },
+    "required": ["base", "path_template"],
+}
+FANTASY_SCORE_PLAYER_WEEK_PARAMETERS: Dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "player_id": {"type": "integer"},
+        "start_date": {"type": "string"},
+        "end_date": {"type": "string"},
+        "scoring": {"type": "object"},
+    },
+    "required": ["player_id", "start_date", "end_date"],
+}
+FANTASY_BEST_PLAYERS_WEEK_PARAMETERS: Dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "player_ids": {"type": "array", "items": {"type": "integer"}},
+        "start_date": {"type": "string"},
+        "end_date": {"type": "string"},
+        "scoring": {"type": "object"},
+        "top_n": {"type": "integer"},
+    },
+    "required": ["player_ids", "start_date", "end_date"],
+}
+FANTASY_BEST_PLAYERS_WEEK_FROM_GAMES_PARAMETERS: Dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "start_date": {"type": "string"},
+        "end_date": {"type": "string"},
+        "scoring": {"type": "object"},
+        "top_n": {"type": "integer"},
+        "min_toi_seconds": {"type": "integer"},
+    },
+    "required": ["start_date", "end_date"],
+}
+
+
 def build_tool_specs(tools: NHLTools, include_eval_tools: bool = True) -> List[ToolSpec]:
     specs = [
         ToolSpec(
             name="nhl_api_list_endpoints",
             description="List the allowed NHL API endpoint catalog the agent can use. Optionally filter by category.",
-            parameters={
-                "type": "object",
-                "properties": {"category": {"type": "string"}},
-            },
+            parameters=LIST_ENDPOINTS_PARAMETERS,
             handler=tools.nhl_api_list_endpoints,
         ),
         ToolSpec(
@@ -933,16 +1157,7 @@ def build_tool_specs(tools: NHLTools, include_eval_tools: bool = True) -> List[T
                 "Provide base ('web' or 'stats'), a path_template that exactly matches a catalog entry, "
                 "optional path_params to fill {tokens}, and optional query_params."
             ),
-            parameters={
-                "type": "object",
-                "properties": {
-                    "base": {"type": "string", "enum": ["web", "stats"]},
-                    "path_template": {"type": "string"},
-                    "path_params": {"type": "object"},
-                    "query_params": {"type": "object"},
-                },
-                "required": ["base", "path_template"],
-            },
+            parameters=NHL_API_CALL_PARAMETERS,
             handler=tools.nhl_api_call,
         ),
     ]
@@ -954,16 +1169,7 @@ def build_tool_specs(tools: NHLTools, include_eval_tools: bool = True) -> List[T
                     description=(
                         "Score a single player's fantasy points between start_date and end_date using optional scoring weights."
                     ),
-                    parameters={
-                        "type": "object",
-                        "properties": {
-                            "player_id": {"type": "integer"},
-                            "start_date": {"type": "string"},
-                            "end_date": {"type": "string"},
-                            "scoring": {"type": "object"},
-                        },
-                        "required": ["player_id", "start_date", "end_date"],
-                    },
+                    parameters=FANTASY_SCORE_PLAYER_WEEK_PARAMETERS,
                     handler=tools.fantasy_score_player_week,
                 ),
                 ToolSpec(
@@ -971,17 +1177,7 @@ def build_tool_specs(tools: NHLTools, include_eval_tools: bool = True) -> List[T
                     description=(
                         "Rank a list of players by fantasy points between start_date and end_date using optional scoring weights."
                     ),
-                    parameters={
-                        "type": "object",
-                        "properties": {
-                            "player_ids": {"type": "array", "items": {"type": "integer"}},
-                            "start_date": {"type": "string"},
-                            "end_date": {"type": "string"},
-                            "scoring": {"type": "object"},
-                            "top_n": {"type": "integer"},
-                        },
-                        "required": ["player_ids", "start_date", "end_date"],
-                    },
+                    parameters=FANTASY_BEST_PLAYERS_WEEK_PARAMETERS,
                     handler=tools.fantasy_best_players_week,
                 ),
                 ToolSpec(
@@ -989,17 +1185,7 @@ def build_tool_specs(tools: NHLTools, include_eval_tools: bool = True) -> List[T
                     description=(
                         "Rank all players by fantasy points for a week by aggregating game boxscores."
                     ),
-                    parameters={
-                        "type": "object",
-                        "properties": {
-                            "start_date": {"type": "string"},
-                            "end_date": {"type": "string"},
-                            "scoring": {"type": "object"},
-                            "top_n": {"type": "integer"},
-                            "min_toi_seconds": {"type": "integer"},
-                        },
-                        "required": ["start_date", "end_date"],
-                    },
+                    parameters=FANTASY_BEST_PLAYERS_WEEK_FROM_GAMES_PARAMETERS,
                     handler=tools.fantasy_best_players_week_from_games,
                 ),
             ]
@@ -0,0 +1,56 @@
+from src.data.cache import DiskCache, hash_key
+
+
+def _files(cache_dir):
+    return [path for path in cache_dir.rglob("*") if path.is_file()]
+
+
+def test_round_trip_through_memory_and_disk(tmp_path):
+    cache = DiskCache(tmp_path)
+    cache.set("https://api/x?", {"a": [1, 2]})
+
+    assert cache.get("https://api/x?") == {"a": [1, 2]}
+    # A fresh instance has an empty memory layer, so this read comes from disk.
+    assert DiskCache(tmp_path).get("https://api/x?") == {"a": [1, 2]}
+    assert DiskCache(tmp_path).get("https://api/missing?") is None
+
+
+def test_entries_are_sharded_by_hash_prefix(tmp_path):
+    cache = DiskCache(tmp_path)
+    cache.set("key", {"a": 1})
+
+    (path,) = _files(tmp_path)
+    digest = hash_key("key")
+    assert path.parent.name == digest[:2]
+    assert path.name.startswith(digest[2:])
+
+
+def test_corrupt_entry_is_deleted_and_treated_as_miss(tmp_path):
+    DiskCache(tmp_path).set("key", {"a": 1})
+    (path,) = _files(tmp_path)
+    path.write_bytes(b"{not json")
+
+    assert DiskCache(tmp_path).get("key") is None
+    assert _files(tmp_path) == []
+
+
+def test_plain_json_entry_still_loads(tmp_path):
+    cache = DiskCache(tmp_path)
+    path = cache._key_to_path("key")
+    path.parent.mkdir(parents=True)
+    path.write_bytes(b'{"a": 1}')
+
+    assert cache.get("key") == {"a": 1}
+
+
+def test_memory_layer_evicts_least_recently_used(tmp_path):
+    cache = DiskCache(tmp_path, memory_entries=2)
+    cache.set("a", {"v": "a"})
+    cache.set("b", {"v": "b"})
+    cache.get("a")
+    cache.set("c", {"v": "c"})
+
+    assert list(cache._memory) == ["a", "c"]
+    # Evicted entries are still served from disk and become most recent again.
+    assert cache.get("b") == {"v": "b"}
+    assert list(cache._memory) == ["c", "b"]
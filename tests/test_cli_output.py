@@ -0,0 +1,33 @@
+import pytest
+
+from src.agent.cli import _join_indented_object
+from src.data import jsonio
+
+
+OUTPUT = {
+    "final": {
+        "decision": {"player_id": 8479318, "top_candidates": [{"player_id": 1, "rank": 1}, {}]},
+        "reasoning": "line one\nline two — \"quoted\"",
+        "empty_list": [],
+        "empty_dict": {},
+        "nested": [[1, 2.5], {"deeper": [None, True, False]}],
+    },
+    "trace": {"tool_calls": [], "tool_results": [{"name": "search_player", "output": {7: "int key"}}]},
+    "evaluation": None,
+}
+
+
+@pytest.fixture(params=["orjson", "stdlib"])
+def json_backend(request, monkeypatch):
+    if request.param == "orjson":
+        if jsonio.orjson is None:
+            pytest.skip("orjson is not installed")
+    else:
+        monkeypatch.setattr(jsonio, "orjson", None)
+    return request.param
+
+
+def test_join_indented_object_matches_whole_object_dump(json_backend):
+    sections = tuple((key, jsonio.dumps_bytes(value, indent=True)) for key, value in OUTPUT.items())
+
+    assert _join_indented_object(sections) == jsonio.dumps_bytes(OUTPUT, indent=True, newline=True)
@@ -0,0 +1,237 @@
+import subprocess
+import sys
+import textwrap
+import threading
+import time
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+
+from src.data import jsonio
+from src.data.cache import DiskCache
+from src.data.normalize import season_id_from_date
+from src.tools import nhl_api
+from src.tools.nhl_api import NHLApiClient, NHLStatsApiClient, is_volatile_path
+
+
+class FakeResponse:
+    def __init__(self, status_code: int = 200, body: Any = None, headers: Dict[str, str] | None = None) -> None:
+        self.status_code = status_code
+        self.content = b"" if body is None else jsonio.dumps_bytes(body)
+        self.headers = headers or {}
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise RuntimeError(f"HTTP {self.status_code}")
+
+
+class FakeSession:
+    """Records every GET; `respond` builds the reply and `gate`, when set, holds requests until released."""
+
+    def __init__(self, respond) -> None:
+        self.respond = respond
+        self.calls: List[Dict[str, Any]] = []
+        self.gate: threading.Event | None = None
+        self._lock = threading.Lock()
+
+    def get(self, url: str, params=None, headers=None, timeout=None) -> FakeResponse:
+        with self._lock:
+            self.calls.append({"url": url, "headers": headers, "timeout": timeout})
+            number = len(self.calls)
+        if self.gate is not None:
+            self.gate.wait(5)
+        return self.respond(number, headers)
+
+
+def _client(tmp_path, session: FakeSession) -> NHLApiClient:
+    return NHLApiClient(cache=DiskCache(tmp_path / "cache"), session=session)
+
+
+def _cached_files(tmp_path) -> List[Any]:
+    return [path for path in (tmp_path / "cache").rglob("*") if path.is_file()]
+
+
+@pytest.fixture
+def no_volatile_ttl(monkeypatch):
+    # Volatile entries expire immediately, so only coalescing can explain a single fetch.
+    monkeypatch.setattr(nhl_api, "VOLATILE_TTL_SECONDS", 0.0)
+
+
+def _run_concurrently(client: NHLApiClient, path: str, count: int, session: FakeSession) -> List[Any]:
+    results: List[Any] = [None] * count
+
+    def call(index: int) -> None:
+        try:
+            results[index] = client.get_json(path)
+        except Exception as exc:  # the owner re-raises a failed fetch
+            results[index] = exc
+
+    session.gate = threading.Event()
+    threads = [threading.Thread(target=call, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.2)  # let every caller reach get_json while the first fetch is held open
+    session.gate.set()
+    for thread in threads:
+        thread.join(5)
+    return results
+
+
+def test_concurrent_identical_requests_share_one_fetch(tmp_path, no_volatile_ttl):
+    session = FakeSession(lambda number, headers: FakeResponse(body={"n": number}))
+    client = _client(tmp_path, session)
+
+    results = _run_concurrently(client, "standings/now", 8, session)
+
+    assert len(session.calls) == 1
+    assert results == [{"n": 1}] * 8
+    assert client._pending == {}
+
+
+def test_waiter_retries_after_owner_fails(tmp_path, no_volatile_ttl):
+    def respond(number: int, headers) -> FakeResponse:
+        return FakeResponse(status_code=500) if number == 1 else FakeResponse(body={"n": number})
+
+    session = FakeSession(respond)
+    client = _client(tmp_path, session)
+
+    results = _run_concurrently(client, "standings/now", 2, session)
+
+    assert sum(isinstance(result, RuntimeError) for result in results) == 1
+    assert {"n": 2} in results
+    assert len(session.calls) == 2
+    assert client._pending == {}
+
+
+def test_prefetch_is_forgotten_once_done(tmp_path):
+    session = FakeSession(lambda number, headers: FakeResponse(body={"n": number}))
+    client = _client(tmp_path, session)
+
+    client.prefetch(["player/1/game-log/20222023/2", "standings/now"])
+    assert client.get_json("player/1/game-log/20222023/2") == {"n": 1}
+    deadline = time.monotonic() + 5
+    while client._pending and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert client._pending == {}
+    # Volatile paths are never prefetched.
+    assert [call["url"] for call in session.calls] == [f"{client.base_url}/player/1/game-log/20222023/2"]
+    assert session.calls[0]["timeout"] == nhl_api.PREFETCH_TIMEOUT_SECONDS
+
+
+def test_queued_prefetches_are_cancelled_at_exit(tmp_path):
+    script = textwrap.dedent(
+        f"""
+        import time
+        from pathlib import Path
+
+        from src.data.cache import DiskCache
+        from src.tools import nhl_api
+
+        class SlowSession:
+            def get(self, url, **kwargs):
+                print("fetch", flush=True)
+                time.sleep(0.5)
+                raise RuntimeError("offline")
+
+        client = nhl_api.NHLApiClient(cache=DiskCache(Path({str(tmp_path)!r})), session=SlowSession())
+        client.prefetch([f"player/{{n}}/game-log/20222023/2" for n in range(3 * nhl_api.PREFETCH_WORKERS)])
+        time.sleep(0.2)
+        """
+    )
+    repo_root = Path(__file__).resolve().parent.parent
+    result = subprocess.run([sys.executable, "-c", script], cwd=repo_root, capture_output=True, text=True, timeout=30)
+
+    assert result.returncode == 0, result.stderr
+    # Only the fetches already running when the interpreter exits are waited for.
+    assert result.stdout.count("fetch") == nhl_api.PREFETCH_WORKERS
+
+
+def test_expired_volatile_entry_is_revalidated_with_etag(tmp_path, no_volatile_ttl):
+    def respond(number: int, headers) -> FakeResponse:
+        if headers and headers.get("If-None-Match") == '"v1"':
+            return FakeResponse(status_code=304, headers={"ETag": '"v1"'})
+        return FakeResponse(body={"standings": []}, headers={"ETag": '"v1"'})
+
+    session = FakeSession(respond)
+    client = _client(tmp_path, session)
+
+    first = client.get_json("standings/now")
+    second = client.get_json("standings/now")
+
+    assert second is first
+    assert session.calls[0]["headers"] is None
+    assert session.calls[1]["headers"] == {"If-None-Match": '"v1"'}
+
+
+@pytest.mark.parametrize("game_state", ["LIVE", "FUT"])
+def test_unfinished_games_are_not_written_to_disk(tmp_path, game_state):
+    session = FakeSession(lambda number, headers: FakeResponse(body={"gameState": game_state}))
+    client = _client(tmp_path, session)
+
+    client.get_json("gamecenter/2023020001/boxscore")
+
+    assert _cached_files(tmp_path) == []
+
+
+def test_now_paths_are_not_written_to_disk(tmp_path):
+    session = FakeSession(lambda number, headers: FakeResponse(body={"gameState": "OFF"}))
+    client = _client(tmp_path, session)
+
+    client.get_json("score/now")
+    assert _cached_files(tmp_path) == []
+
+    client.get_json("gamecenter/2023020001/boxscore")
+    assert len(_cached_files(tmp_path)) == 1
+
+
+TODAY = date.today()
+CURRENT_SEASON = season_id_from_date(TODAY.isoformat())
+LAST_SEASON = f"{int(CURRENT_SEASON[:4]) - 1}{CURRENT_SEASON[:4]}"
+NEXT_SEASON = f"{CURRENT_SEASON[4:]}{int(CURRENT_SEASON[4:]) + 1}"
+
+
+@pytest.mark.parametrize(
+    "path, params, volatile",
+    [
+        ("standings/now", None, True),
+        (f"schedule/{TODAY.isoformat()}", None, True),
+        (f"schedule/{(TODAY - timedelta(days=1)).isoformat()}", None, False),
+        (f"player/8479318/game-log/{CURRENT_SEASON}/2", None, True),
+        (f"club-schedule-season/TOR/{NEXT_SEASON}", None, True),
+        (f"player/8479318/game-log/{LAST_SEASON}/2", None, False),
+        # Game ids and other long numbers are not season ids.
+        ("gamecenter/2023020001/boxscore", None, False),
+        ("skater/summary", {"cayenneExp": f"seasonId={CURRENT_SEASON} and gameTypeId=2"}, True),
+        ("skater/summary", {"cayenneExp": f"seasonId={LAST_SEASON} and gameTypeId=2"}, False),
+        ("skater/summary", {"cayenneExp": f'gameDate<="{TODAY.isoformat()}"'}, True),
+        ("skater/summary", {"cayenneExp": 'gameDate<="2024-01-07"', "limit": 20240107}, False),
+        ("skater/summary", {"season": "current"}, True),
+    ],
+)
+def test_is_volatile_path(path, params, volatile):
+    assert is_volatile_path(path, params) is volatile
+
+
+def test_running_season_game_log_is_not_written_to_disk(tmp_path):
+    session = FakeSession(lambda number, headers: FakeResponse(body={"gameLog": []}))
+    client = _client(tmp_path, session)
+
+    client.get_json(f"player/8479318/game-log/{CURRENT_SEASON}/2")
+    assert _cached_files(tmp_path) == []
+
+    client.get_json(f"player/8479318/game-log/{LAST_SEASON}/2")
+    assert len(_cached_files(tmp_path)) == 1
+
+
+def test_running_season_stats_query_is_not_written_to_disk(tmp_path):
+    session = FakeSession(lambda number, headers: FakeResponse(body={"data": []}))
+    client = NHLStatsApiClient(cache=DiskCache(tmp_path / "cache"), session=session)
+
+    client.get_json("skater/summary", params={"cayenneExp": f"seasonId={CURRENT_SEASON}"})
+    assert _cached_files(tmp_path) == []
+
+    client.get_json("skater/summary", params={"cayenneExp": f"seasonId={LAST_SEASON}"})
+    assert len(_cached_files(tmp_path)) == 1
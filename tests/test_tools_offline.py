@@ -0,0 +1,149 @@
+from pathlib import Path
+from typing import Any, Dict, List
+
+from src.data import jsonio
+from src.data.cache import DiskCache
+from src.tools.nhl_api import NHLApiClient
+from src.tools.tools import NHLTools
+
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+
+
+SEARCH_PAYLOAD = {"players": [{"playerId": 8479318, "name": "Auston Matthews", "teamAbbrev": "TOR"}]}
+
+
+class FakeClient:
+    """Minimal client: only get_json, serving canned payloads by path."""
+
+    def __init__(self, payloads: Dict[str, Any]) -> None:
+        self.payloads = payloads
+        self.requested: List[str] = []
+
+    def get_json(self, path: str, params: Dict[str, Any] | None = None) -> Any:
+        self.requested.append(path)
+        return self.payloads.get(path, {})
+
+
+class PrefetchingClient(FakeClient):
+    def __init__(self, payloads: Dict[str, Any]) -> None:
+        super().__init__(payloads)
+        self.prefetched: List[str] = []
+
+    def prefetch(self, paths: List[str]) -> None:
+        self.prefetched.extend(paths)
+
+
+class OfflineSession:
+    def get(self, url: str, **kwargs: Any) -> Any:
+        raise AssertionError(f"unexpected network request: {url}")
+
+
+def _tools(client: Any, **kwargs: Any) -> NHLTools:
+    return NHLTools(client=client, stats_client=FakeClient({}), **kwargs)
+
+
+def test_team_schedule_from_recorded_payload(tmp_path):
+    client = NHLApiClient(cache=DiskCache(tmp_path), session=OfflineSession())
+    payload = jsonio.load_path(FIXTURES_DIR / "club_schedule_season_TOR_20232024.json")
+    client.cache.set(f"{client.base_url}/club-schedule-season/TOR/20232024?", payload)
+
+    result = _tools(client).get_team_schedule("TOR", "2024-01-22", "2024-01-28")
+
+    assert result == {
+        "team": "TOR",
+        "games": [
+            {"date": "2024-01-24", "opponent": "WPG", "home_away": "home", "game_id": 2023020740},
+            {"date": "2024-01-27", "opponent": "WPG", "home_away": "away", "game_id": 2023020768},
+        ],
+    }
+
+
+def test_search_player_ignores_malformed_as_of_date_when_prefetching():
+    for as_of_date in ("bogus", "2018/01/15"):
+        client = PrefetchingClient({"player-search/Matthews": SEARCH_PAYLOAD})
+        tools = _tools(client, as_of_date=as_of_date, prefetch_search_results=True)
+        result = tools.search_player("Matthews")
+        assert result["candidates"][0]["player_id"] == 8479318
+        assert client.prefetched == []
+
+
+def test_search_player_works_with_client_without_prefetch():
+    client = FakeClient({"player-search/Matthews": SEARCH_PAYLOAD})
+    tools = _tools(client, as_of_date="2024-01-15", prefetch_search_results=True)
+    assert tools.search_player("Matthews")["candidates"][0]["full_name"] == "Auston Matthews"
+
+
+def test_search_player_prefetch_is_opt_in_and_skips_current_season():
+    client = PrefetchingClient({"player-search/Matthews": SEARCH_PAYLOAD})
+    _tools(client, as_of_date="2024-01-15").search_player("Matthews")
+    assert client.prefetched == []
+
+    _tools(client, as_of_date="2024-01-15", prefetch_search_results=True).search_player("Matthews")
+    assert client.prefetched == ["player/8479318/game-log/20232024/2"]
+
+    client.prefetched.clear()
+    _tools(client, prefetch_search_results=True).search_player("Matthews")
+    assert client.prefetched == []
+
+
+def _game_log(*games: Any) -> Dict[str, Any]:
+    return {
+        "gameLog": [{"gameDate": day, "gameId": game_id, "goals": goals, "assists": 0} for day, game_id, goals in games]
+    }
+
+
+def test_fantasy_best_players_week_with_get_json_only_client():
+    client = FakeClient(
+        {
+            "player/1/game-log/20232024/2": _game_log(("2024-01-02", 10, 1)),
+            "player/2/game-log/20232024/2": _game_log(("2024-01-02", 10, 2), ("2024-01-04", 11, 1)),
+        }
+    )
+    result = _tools(client).fantasy_best_players_week([1, 2], "2024-01-01", "2024-01-07", top_n=2)
+
+    assert [entry["player_id"] for entry in result["results"]] == [2, 1]
+    assert [entry["fantasy_points"] for entry in result["results"]] == [6.0, 2.0]
+
+
+def test_fantasy_best_players_week_from_games_with_get_json_only_client():
+    def skater(player_id: int, goals: int) -> Dict[str, Any]:
+        return {"playerId": player_id, "name": f"P{player_id}", "toi": "15:00", "goals": goals}
+
+    client = FakeClient(
+        {
+            "schedule/2024-01-01": {"gameWeek": [{"date": "2024-01-02", "games": [{"id": 10}]}]},
+            "gamecenter/10/boxscore": {
+                "playerByGameStats": {
+                    "homeTeam": {"forwards": [skater(1, 2)]},
+                    "awayTeam": {"defense": [skater(2, 1)]},
+                }
+            },
+        }
+    )
+    result = _tools(client).fantasy_best_players_week_from_games("2024-01-01", "2024-01-07")
+
+    assert [entry["player_id"] for entry in result["results"]] == [1, 2]
+    assert "gamecenter/10/boxscore" in client.requested
+
+
+def test_ranked_player_rank_does_not_depend_on_top_n():
+    # Players 1-3 tie on 2 points behind player 4's 4; player 3 is listed last among the tied players.
+    client = FakeClient(
+        {
+            f"player/{player_id}/game-log/20232024/2": _game_log(("2024-01-02", 10, goals))
+            for player_id, goals in ((1, 1), (2, 1), (3, 1), (4, 2))
+        }
+    )
+    tools = _tools(client)
+    for top_n in (1, 2, 3, 4):
+        result = tools.fantasy_best_players_week(
+            [1, 2, 3, 4], "2024-01-01", "2024-01-07", top_n=top_n, rank_player_id=3
+        )
+        positions = [entry["player_id"] for entry in result["results"]]
+        assert result["ranked_player"]["rank"] == 4
+        if 3 in positions:
+            assert positions.index(3) + 1 == 4
+
+    result = tools.fantasy_best_players_week([1, 2, 3, 4], "2024-01-01", "2024-01-07", top_n=1, rank_player_id=99)
+    assert "ranked_player" not in result